@@ -3,7 +3,7 @@ Analytics reporter for generating comprehensive risk reports and visualizations.
 """
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
@@ -16,7 +16,7 @@ from loguru import logger
 from exchanges.base import Position, MarketData
 from risk.calculator import RiskMetrics
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PortfolioSnapshot:
     """Portfolio snapshot data structure."""
     timestamp: datetime
@@ -30,7 +30,7 @@ class PortfolioSnapshot:
     max_drawdown: float
     positions: List[Position]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PerformanceMetrics:
     """Performance metrics data structure."""
     total_return: float
@@ -77,6 +77,81 @@ class AnalyticsReporter:
             logger.error(f"Error generating portfolio report: {e}")
             return {}
     
+    def generate_report_and_metrics(self, positions: List[Position],
+                                    market_data_dict: Dict[str, MarketData],
+                                    risk_calculator: Any) -> Tuple[Optional[RiskMetrics], Dict[str, Any]]:
+        """
+        Compute portfolio risk metrics and the portfolio report in a single pass.
+
+        Greeks, values, P&L and the position breakdown are accumulated while
+        walking the positions once, instead of once in the risk calculator and
+        again for the report summary and breakdown.
+
+        Returns:
+            Tuple of (portfolio RiskMetrics or None, report dict or {})
+        """
+        try:
+            total_delta = total_gamma = total_theta = total_vega = 0.0
+            risk_value = 0.0
+            total_value = 0.0
+            total_pnl = 0.0
+            breakdown = []
+
+            for position in positions:
+                market_data = market_data_dict.get(position.symbol)
+                if market_data is None:
+                    continue
+                position_value = position.size * market_data.price
+                pnl = position.unrealized_pnl
+                total_value += position_value
+                total_pnl += pnl
+                breakdown.append({
+                    "symbol": position.symbol,
+                    "side": position.side,
+                    "size": position.size,
+                    "current_price": market_data.price,
+                    "position_value": position_value,
+                    "unrealized_pnl": pnl,
+                    "return_pct": (pnl / position_value * 100) if position_value > 0 else 0
+                })
+
+                position_metrics = risk_calculator.calculate_position_greeks(position, market_data)
+                if position_metrics:
+                    total_delta += position_metrics.delta
+                    total_gamma += position_metrics.gamma
+                    total_theta += position_metrics.theta
+                    total_vega += position_metrics.vega
+                    risk_value += position_value
+
+            risk_metrics = risk_calculator.build_portfolio_metrics(
+                total_delta, total_gamma, total_theta, total_vega, risk_value
+            )
+        except Exception as e:
+            logger.error(f"Error calculating portfolio risk: {e}")
+            return None, {}
+
+        try:
+            report = {
+                "timestamp": datetime.now(),
+                "summary": {
+                    "total_value": total_value,
+                    "total_pnl": total_pnl,
+                    "position_count": len(positions),
+                    "return_pct": (total_pnl / total_value * 100) if total_value > 0 else 0,
+                    "risk_level": self._determine_risk_level(risk_metrics)
+                },
+                "risk_metrics": self._format_risk_metrics(risk_metrics),
+                "position_breakdown": breakdown,
+                "correlation_matrix": self._calculate_correlation_matrix(positions),
+                "stress_test_results": self._run_stress_tests(positions, market_data_dict),
+                "performance_metrics": self._calculate_performance_metrics(),
+                "recommendations": self._generate_recommendations(risk_metrics)
+            }
+            return risk_metrics, report
+        except Exception as e:
+            logger.error(f"Error generating portfolio report: {e}")
+            return risk_metrics, {}
+
     def _generate_summary(self, positions: List[Position], 
                          market_data_dict: Dict[str, MarketData],
                          risk_metrics: RiskMetrics) -> Dict[str, Any]:
@@ -418,25 +493,26 @@ class AnalyticsReporter:
             logger.error(f"Error creating risk metrics chart: {e}")
             return ""
     
-    def generate_telegram_report(self, report: Dict[str, Any]) -> str:
-        """Generate formatted report for Telegram."""
-        try:
-            summary = report.get("summary", {})
-            risk_metrics = report.get("risk_metrics", {})
-            recommendations = report.get("recommendations", [])
-            
-            report_text = f"""
+    def _telegram_report_sections(self, report: Dict[str, Any]) -> Iterator[str]:
+        """Yield the Telegram report as section-level fragments."""
+        summary = report.get("summary", {})
+        risk_metrics = report.get("risk_metrics", {})
+        recommendations = report.get("recommendations", [])
+        
+        yield f"""
 📊 *Portfolio Risk Report*
 *Generated:* {report['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}
 
-💰 *Portfolio Summary*
+"""
+        yield f"""💰 *Portfolio Summary*
 • Total Value: ${summary.get('total_value', 0):,.2f}
 • Total P&L: ${summary.get('total_pnl', 0):,.2f}
 • Return: {summary.get('return_pct', 0):.2f}%
 • Risk Level: {summary.get('risk_level', 'UNKNOWN')}
 • Positions: {summary.get('position_count', 0)}
 
-📈 *Risk Metrics*
+"""
+        yield f"""📈 *Risk Metrics*
 • Delta: ${risk_metrics.get('delta', 0):,.2f}
 • Gamma: ${risk_metrics.get('gamma', 0):,.2f}
 • VaR (95%): ${risk_metrics.get('var_95', 0):,.2f}
@@ -444,18 +520,53 @@ class AnalyticsReporter:
 • Max Drawdown: ${risk_metrics.get('max_drawdown', 0):,.2f}
 • Beta: {risk_metrics.get('beta', 0):.2f}
 
-💡 *Recommendations*
 """
-            
-            for rec in recommendations:
-                report_text += f"• {rec}\n"
-            
-            return report_text
+        yield "💡 *Recommendations*\n"
+        for rec in recommendations:
+            yield f"• {rec}\n"
+    
+    def generate_telegram_report(self, report: Dict[str, Any]) -> str:
+        """Generate formatted report for Telegram."""
+        try:
+            return "".join(self._telegram_report_sections(report))
             
         except Exception as e:
             logger.error(f"Error generating Telegram report: {e}")
             return "❌ Error generating report"
     
+    def generate_telegram_report_chunks(self, report: Dict[str, Any], max_len: int = 4000) -> Iterator[str]:
+        """
+        Generate the Telegram report as message-sized chunks.
+        
+        Sections are packed into chunks of at most max_len characters, splitting
+        at section boundaries (or line boundaries for oversized sections). A single
+        line longer than max_len is hard-split and may cut through a formatting
+        entity. The sections are built before anything is yielded, so a failure
+        yields only the error message, never a partial report.
+        """
+        try:
+            sections = list(self._telegram_report_sections(report))
+        except Exception as e:
+            logger.error(f"Error generating Telegram report chunks: {e}")
+            yield "❌ Error generating report"
+            return
+        
+        buffer = []
+        size = 0
+        for section in sections:
+            pieces = [section] if len(section) <= max_len else section.splitlines(keepends=True)
+            for piece in pieces:
+                if size and size + len(piece) > max_len:
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+                while len(piece) > max_len:
+                    yield piece[:max_len]
+                    piece = piece[max_len:]
+                buffer.append(piece)
+                size += len(piece)
+        if buffer:
+            yield "".join(buffer)
+    
     def calculate_pnl_attribution(self, positions: List[Position],
                                 market_data_dict: Dict[str, MarketData],
                                 previous_positions: List[Position] = None) -> Dict[str, Any]:
@@ -9,29 +9,27 @@ from utils.config import Config
 from exchanges.okx import OKXExchange
 from exchanges.bybit import BybitExchange
 from exchanges.deribit import DeribitExchange
+from exchanges.session import close_shared_session
 from risk.calculator import RiskCalculator, RiskMetrics
 from hedging.strategies import HedgingManager
 from analytics.reporter import AnalyticsReporter
 from exchanges.base import Position, MarketData
 
-async def test_exchange_connections():
-    """Test exchange connections."""
-    logger.info("Testing exchange connections...")
-    
-    # Test Deribit (primary exchange)
+async def _probe_deribit():
+    """Probe Deribit (primary exchange)."""
     try:
         deribit = DeribitExchange({})
         connected = await deribit.connect()
         if connected:
             logger.info("✅ Deribit connection successful")
             
-            # Test market data
-            market_data = await deribit.get_market_data("BTC-PERPETUAL")
+            # Test market data and options chain concurrently
+            market_data, options = await asyncio.gather(
+                deribit.get_market_data("BTC-PERPETUAL"),
+                deribit.get_instruments("BTC")
+            )
             if market_data:
                 logger.info(f"✅ Deribit BTC price: ${market_data.price:,.2f}")
-            
-            # Test options chain
-            options = await deribit.get_instruments("BTC")
             if options:
                 logger.info(f"✅ Deribit instruments available: {len(options)}")
             
@@ -40,8 +38,9 @@ async def test_exchange_connections():
             logger.error("❌ Deribit connection failed")
     except Exception as e:
         logger.error(f"❌ Deribit error: {e}")
-    
-    # Test OKX (public data only)
+
+async def _probe_okx():
+    """Probe OKX (public data only)."""
     try:
         okx = OKXExchange({})
         connected = await okx.connect()
@@ -58,8 +57,9 @@ async def test_exchange_connections():
             logger.error("❌ OKX connection failed")
     except Exception as e:
         logger.error(f"❌ OKX error: {e}")
-    
-    # Test Bybit (public data only)
+
+async def _probe_bybit():
+    """Probe Bybit (public data only)."""
     try:
         bybit = BybitExchange({})
         connected = await bybit.connect()
@@ -77,6 +77,13 @@ async def test_exchange_connections():
     except Exception as e:
         logger.error(f"❌ Bybit error: {e}")
 
+async def test_exchange_connections():
+    """Test exchange connections."""
+    logger.info("Testing exchange connections...")
+    
+    # Exchanges are independent, so probe them concurrently
+    await asyncio.gather(_probe_deribit(), _probe_okx(), _probe_bybit())
+
 async def test_risk_calculations():
     """Test risk calculations."""
     logger.info("Testing risk calculations...")
@@ -181,7 +188,7 @@ async def test_hedging_strategies():
     if hedge_order:
         logger.info("✅ Hedge order calculated")
         logger.info(f"   Symbol: {hedge_order.symbol}")
-        logger.info(f"   Side: {hedge_order.side}")
+        logger.info(f"   Side: {hedge_order.side_str}")
         logger.info(f"   Size: {hedge_order.size:,.2f}")
     else:
         logger.error("❌ Hedge order calculation failed")
@@ -267,6 +274,7 @@ async def main():
     await test_analytics()
     logger.info("-" * 30)
     
+    await close_shared_session()
     logger.info("✅ Demo completed successfully!")
     logger.info("=" * 50)
 
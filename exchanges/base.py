@@ -1,21 +1,92 @@
 """
 Base exchange interface for all exchange implementations.
 """
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
+import numpy as np
+from loguru import logger
 
-@dataclass
+INSTRUMENT_CACHE_TTL = 300.0  # Seconds instrument listings are served from memory
+
+# (bid price, bid size, ask price, ask size)
+TopOfBook = Tuple[float, float, float, float]
+
+def _top_of_book(bids: List[List[Any]], asks: List[List[Any]]) -> Optional[TopOfBook]:
+    """First bid/ask level of raw exchange levels, or None if either side is empty."""
+    if not bids or not asks:
+        return None
+    bid, ask = bids[0], asks[0]
+    return float(bid[0]), float(bid[1]), float(ask[0]), float(ask[1])
+
+def _levels_to_arrays(levels: List[List[Any]]) -> tuple[np.ndarray, np.ndarray]:
+    """Split exchange [price, size, ...] levels into read-only float64 price and size arrays."""
+    # One C-level parse of the whole nested list (numeric strings included); extra columns are dropped
+    arr = np.asarray(levels, dtype=np.float64) if len(levels) else np.empty((0, 2))
+    prices = np.ascontiguousarray(arr[:, 0])
+    sizes = np.ascontiguousarray(arr[:, 1])
+    prices.flags.writeable = False
+    sizes.flags.writeable = False
+    return prices, sizes
+
+# eq=False: array fields can't be compared/hashed by value, so snapshots compare by identity
+@dataclass(slots=True, frozen=True, eq=False)
 class OrderBook:
-    """Order book data structure."""
+    """Order book data structure, levels stored as parallel float64 arrays (best level first)."""
     symbol: str
-    bids: List[Dict[str, float]]  # [price, size]
-    asks: List[Dict[str, float]]  # [price, size]
-    timestamp: datetime
+    bid_prices: np.ndarray
+    bid_sizes: np.ndarray
+    ask_prices: np.ndarray
+    ask_sizes: np.ndarray
+    timestamp_ms: int  # Exchange timestamp in epoch milliseconds, stored as received
     exchange: str
+    # Top of book as Python floats, computed once per snapshot (None where a side is empty)
+    best_bid: Optional[float] = field(init=False, default=None)
+    best_ask: Optional[float] = field(init=False, default=None)
+    mid: Optional[float] = field(init=False, default=None)
+    
+    def __post_init__(self):
+        best_bid = float(self.bid_prices[0]) if self.bid_prices.size else None
+        best_ask = float(self.ask_prices[0]) if self.ask_prices.size else None
+        object.__setattr__(self, 'best_bid', best_bid)
+        object.__setattr__(self, 'best_ask', best_ask)
+        if best_bid and best_ask:
+            object.__setattr__(self, 'mid', (best_bid + best_ask) / 2)
+    
+    def top(self, fallback: float) -> Tuple[float, float, float]:
+        """(best bid, best ask, their midpoint), using fallback for an empty side."""
+        bid = self.best_bid if self.best_bid is not None else fallback
+        ask = self.best_ask if self.best_ask is not None else fallback
+        return bid, ask, (bid + ask) / 2
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Snapshot time as a local datetime, converted only when asked for."""
+        return datetime.fromtimestamp(self.timestamp_ms / 1000)
+    
+    @property
+    def bids(self) -> List[Dict[str, float]]:
+        """Bid levels as [{'price', 'size'}] dicts, built on access for callers needing that shape."""
+        return [{"price": p, "size": q} for p, q in zip(self.bid_prices.tolist(), self.bid_sizes.tolist())]
+    
+    @property
+    def asks(self) -> List[Dict[str, float]]:
+        """Ask levels as [{'price', 'size'}] dicts, built on access for callers needing that shape."""
+        return [{"price": p, "size": q} for p, q in zip(self.ask_prices.tolist(), self.ask_sizes.tolist())]
+    
+    @classmethod
+    def from_levels(cls, symbol: str, bids: List[List[Any]], asks: List[List[Any]],
+                    timestamp_ms: int, exchange: str) -> "OrderBook":
+        """Build an order book from raw exchange levels; extra columns beyond price/size are ignored."""
+        bid_prices, bid_sizes = _levels_to_arrays(bids)
+        ask_prices, ask_sizes = _levels_to_arrays(asks)
+        return cls(symbol, bid_prices, bid_sizes, ask_prices, ask_sizes, timestamp_ms, exchange)
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Position data structure."""
     symbol: str
@@ -32,7 +103,7 @@ class Position:
     expiry: Optional[datetime] = None
     underlying: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class MarketData:
     """Market data structure."""
     symbol: str
@@ -46,14 +117,29 @@ class MarketData:
     strike: Optional[float] = None
     expiry: Optional[datetime] = None
     underlying: Optional[str] = None
+    
+    @classmethod
+    def for_position(cls, symbol: str, price: float, position: Position, timestamp: datetime) -> "MarketData":
+        """Build market data for a position's instrument, copying its exchange and option fields."""
+        return cls(symbol, price, 0.0, 0.0, timestamp, position.exchange,
+                   position.option_type, position.strike, position.expiry, position.underlying)
 
 class BaseExchange(ABC):
-    """Base class for all exchange implementations."""
+    """Base class for all exchange implementations.
+    
+    Instances have no __dict__; subclasses must declare __slots__ for any
+    attributes they add. config is exposed as a read-only mapping.
+    """
+    __slots__ = ('name', 'config', 'is_connected', '_instr_cache', '_warned_auth')
     
     def __init__(self, name: str, config: Dict[str, Any]):
         self.name = name
-        self.config = config
+        self.config = MappingProxyType(dict(config or {}))
         self.is_connected = False
+        # Instrument listings: {key: (monotonic_ts, [instrument names])}
+        self._instr_cache: Dict[tuple, tuple] = {}
+        # Authentication warnings already logged (each is emitted once per instance)
+        self._warned_auth: set = set()
     
     @abstractmethod
     async def connect(self) -> bool:
@@ -70,6 +156,22 @@ class BaseExchange(ABC):
         """Get order book for a symbol."""
         pass
     
+    async def get_orderbooks(self, symbols: List[str], depth: int = 20) -> List[Optional[OrderBook]]:
+        """Get order books for several symbols concurrently, in order (None where a fetch failed)."""
+        results = await asyncio.gather(*(self.get_orderbook(s, depth) for s in symbols), return_exceptions=True)
+        return [None if isinstance(r, BaseException) else r for r in results]
+    
+    async def get_top_of_book(self, symbol: str) -> Optional[TopOfBook]:
+        """Get (bid price, bid size, ask price, ask size) for a symbol, or None.
+        
+        Generic version via a depth-1 order book; adapters override it to skip OrderBook construction.
+        """
+        orderbook = await self.get_orderbook(symbol, depth=1)
+        if orderbook is None or not orderbook.bid_prices.size or not orderbook.ask_prices.size:
+            return None
+        return (float(orderbook.bid_prices[0]), float(orderbook.bid_sizes[0]),
+                float(orderbook.ask_prices[0]), float(orderbook.ask_sizes[0]))
+    
     @abstractmethod
     async def get_market_data(self, symbol: str) -> Optional[MarketData]:
         """Get market data for a symbol."""
@@ -96,18 +198,35 @@ class BaseExchange(ABC):
         """Get balance for a currency."""
         pass
     
+    def _warn_auth_once(self, message: str):
+        """Log an authentication-required warning the first time it occurs, not on every call."""
+        if message not in self._warned_auth:
+            self._warned_auth.add(message)
+            logger.warning(message)
+    
+    def _get_cached_instruments(self, key: tuple) -> Optional[List[str]]:
+        """Return a cached instrument listing if it is younger than INSTRUMENT_CACHE_TTL."""
+        entry = self._instr_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < INSTRUMENT_CACHE_TTL:
+            return entry[1]
+        return None
+    
+    def _cache_instruments(self, key: tuple, instruments: List[str]) -> List[str]:
+        """Store an instrument listing and return it."""
+        self._instr_cache[key] = (time.monotonic(), instruments)
+        return instruments
+    
+    def invalidate_instruments(self):
+        """Drop all cached instrument listings so the next call refetches them."""
+        self._instr_cache.clear()
+    
     def get_best_bid_ask(self, orderbook: OrderBook) -> tuple[float, float]:
         """Get best bid and ask prices from orderbook."""
-        if not orderbook.bids or not orderbook.asks:
+        if orderbook.best_bid is None or orderbook.best_ask is None:
             return None, None
         
-        best_bid = orderbook.bids[0]['price']
-        best_ask = orderbook.asks[0]['price']
-        return best_bid, best_ask
+        return orderbook.best_bid, orderbook.best_ask
     
     def calculate_mid_price(self, orderbook: OrderBook) -> float:
         """Calculate mid price from orderbook."""
-        best_bid, best_ask = self.get_best_bid_ask(orderbook)
-        if best_bid and best_ask:
-            return (best_bid + best_ask) / 2
-        return None 
\ No newline at end of file
+        return orderbook.mid 
\ No newline at end of file
@@ -1,26 +1,34 @@
 """
 Bybit exchange integration using public API.
 """
-import aiohttp
 import asyncio
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from loguru import logger
+from yarl import URL
 
-from exchanges.base import BaseExchange, OrderBook, Position, MarketData
+from utils.json_codec import loads
+from exchanges.session import COMPRESSED_HEADERS, decode_json, get_shared_session, query_url
+from exchanges.schemas import decode_bybit_orderbook, decode_bybit_ticker
+from exchanges.base import BaseExchange, OrderBook, Position, MarketData, TopOfBook, _top_of_book
 
 class BybitExchange(BaseExchange):
     """Bybit exchange implementation."""
+    __slots__ = ('base_url', 'session', '_url_orderbook', '_url_tickers', '_url_instruments')
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__("Bybit", config)
         self.base_url = "https://api.bybit.com"
         self.session = None
+        # Endpoint URLs are fixed per exchange, so build them once instead of per request
+        self._url_orderbook = URL(f"{self.base_url}/v5/market/orderbook")
+        self._url_tickers = URL(f"{self.base_url}/v5/market/tickers")
+        self._url_instruments = URL(f"{self.base_url}/v5/market/instruments-info")
     
     async def connect(self) -> bool:
         """Connect to Bybit API."""
         try:
-            self.session = aiohttp.ClientSession()
+            self.session = get_shared_session()
             # Test connection with a simple API call
             async with self.session.get(f"{self.base_url}/v5/market/time") as response:
                 if response.status == 200:
@@ -37,8 +45,8 @@ class BybitExchange(BaseExchange):
     async def disconnect(self) -> bool:
         """Disconnect from Bybit API."""
         try:
-            if self.session:
-                await self.session.close()
+            # The session is shared with other exchanges; just release our reference
+            self.session = None
             self.is_connected = False
             logger.info(f"Disconnected from {self.name}")
             return True
@@ -52,40 +60,46 @@ class BybitExchange(BaseExchange):
             return None
         
         try:
-            url = f"{self.base_url}/v5/market/orderbook"
-            params = {
-                "category": "spot",
-                "symbol": symbol,
-                "limit": depth
-            }
+            url = query_url(self._url_orderbook, category="spot", symbol=symbol, limit=depth)
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(url) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    if data.get("retCode") == 0 and data.get("result"):
-                        orderbook_data = data["result"]
-                        
-                        bids = [
-                            {"price": float(bid[0]), "size": float(bid[1])}
-                            for bid in orderbook_data.get("b", [])
-                        ]
-                        asks = [
-                            {"price": float(ask[0]), "size": float(ask[1])}
-                            for ask in orderbook_data.get("a", [])
-                        ]
-                        
-                        return OrderBook(
+                    fields = decode_bybit_orderbook(await response.read())
+                    if fields is not None:
+                        bids, asks, timestamp_ms = fields
+
+                        return OrderBook.from_levels(
                             symbol=symbol,
                             bids=bids,
                             asks=asks,
-                            timestamp=datetime.fromtimestamp(int(orderbook_data.get("ts", 0)) / 1000),
+                            timestamp_ms=timestamp_ms,
                             exchange=self.name
                         )
                 else:
-                    logger.error(f"Failed to get orderbook for {symbol}: {response.status}")
+                    logger.error("Failed to get orderbook for {}: {}", symbol, response.status)
                     return None
         except Exception as e:
-            logger.error(f"Error getting orderbook for {symbol}: {e}")
+            logger.error("Error getting orderbook for {}: {}", symbol, e)
+            return None
+    
+    async def get_top_of_book(self, symbol: str) -> Optional[TopOfBook]:
+        """Get best bid/ask price and size from a depth-1 book without building an OrderBook."""
+        if not self.is_connected:
+            return None
+        
+        try:
+            url = query_url(self._url_orderbook, category="spot", symbol=symbol, limit=1)
+            
+            async with self.session.get(url) as response:
+                if response.status == 200:
+                    fields = decode_bybit_orderbook(await response.read())
+                    if fields is not None:
+                        return _top_of_book(fields[0], fields[1])
+                else:
+                    logger.error("Failed to get top of book for {}: {}", symbol, response.status)
+                return None
+        except Exception as e:
+            logger.error("Error getting top of book for {}: {}", symbol, e)
             return None
     
     async def get_market_data(self, symbol: str) -> Optional[MarketData]:
@@ -94,69 +108,100 @@ class BybitExchange(BaseExchange):
             return None
         
         try:
-            url = f"{self.base_url}/v5/market/tickers"
-            params = {
-                "category": "spot",
-                "symbol": symbol
-            }
+            url = query_url(self._url_tickers, category="spot", symbol=symbol)
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(url) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    if data.get("retCode") == 0 and data.get("result", {}).get("list"):
-                        ticker_data = data["result"]["list"][0]
-                        
+                    fields = decode_bybit_ticker(await response.read())
+                    if fields is not None:
+                        price, volume_24h, change_24h, time_ms = fields
+
                         return MarketData(
                             symbol=symbol,
-                            price=float(ticker_data.get("lastPrice", 0)),
-                            volume_24h=float(ticker_data.get("volume24h", 0)),
-                            change_24h=float(ticker_data.get("price24hPcnt", 0)),
-                            timestamp=datetime.fromtimestamp(int(ticker_data.get("time", 0)) / 1000),
+                            price=price,
+                            volume_24h=volume_24h,
+                            change_24h=change_24h,
+                            timestamp=datetime.fromtimestamp(time_ms / 1000),
                             exchange=self.name
                         )
                 else:
-                    logger.error(f"Failed to get market data for {symbol}: {response.status}")
+                    logger.error("Failed to get market data for {}: {}", symbol, response.status)
                     return None
         except Exception as e:
-            logger.error(f"Error getting market data for {symbol}: {e}")
+            logger.error("Error getting market data for {}: {}", symbol, e)
             return None
     
+    async def get_market_data_bulk(self, symbols: Optional[List[str]] = None) -> Dict[str, MarketData]:
+        """Get spot market data for many symbols from one tickers request (all symbols if None)."""
+        if not self.is_connected:
+            return {}
+        
+        try:
+            url = query_url(self._url_tickers, category="spot")
+            
+            async with self.session.get(url) as response:
+                if response.status == 200:
+                    data = loads(await response.read())
+                    if data.get("retCode") == 0 and data.get("result", {}).get("list"):
+                        wanted = set(symbols) if symbols is not None else None
+                        timestamp = datetime.fromtimestamp(int(data.get("time", 0)) / 1000)
+                        return {
+                            item["symbol"]: MarketData(
+                                symbol=item["symbol"],
+                                price=float(item.get("lastPrice", 0)),
+                                volume_24h=float(item.get("volume24h", 0)),
+                                change_24h=float(item.get("price24hPcnt", 0)),
+                                timestamp=timestamp,
+                                exchange=self.name
+                            )
+                            for item in data["result"]["list"]
+                            if wanted is None or item["symbol"] in wanted
+                        }
+                else:
+                    logger.error("Failed to get bulk market data: {}", response.status)
+                return {}
+        except Exception as e:
+            logger.error("Error getting bulk market data: {}", e)
+            return {}
+    
     async def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
         """Get current positions (requires authentication)."""
         # For demo purposes, return empty list since we're using public API
-        logger.warning("Position data requires authentication - returning empty list for demo")
+        self._warn_auth_once("Position data requires authentication - returning empty list for demo")
         return []
     
     async def place_order(self, symbol: str, side: str, size: float, 
                          order_type: str = "market", price: Optional[float] = None) -> Dict[str, Any]:
         """Place an order (requires authentication)."""
-        logger.warning("Order placement requires authentication - not implemented for demo")
+        self._warn_auth_once("Order placement requires authentication - not implemented for demo")
         return {"success": False, "message": "Authentication required"}
     
     async def cancel_order(self, order_id: str, symbol: str) -> bool:
         """Cancel an order (requires authentication)."""
-        logger.warning("Order cancellation requires authentication - not implemented for demo")
+        self._warn_auth_once("Order cancellation requires authentication - not implemented for demo")
         return False
     
     async def get_balance(self, currency: str) -> float:
         """Get balance for a currency (requires authentication)."""
-        logger.warning("Balance data requires authentication - returning 0 for demo")
+        self._warn_auth_once("Balance data requires authentication - returning 0 for demo")
         return 0.0
     
     async def get_perpetual_contracts(self) -> List[str]:
-        """Get available perpetual contract symbols."""
+        """Get available perpetual contract symbols (cached for INSTRUMENT_CACHE_TTL)."""
         if not self.is_connected:
             return []
+        cached = self._get_cached_instruments(("linear",))
+        if cached is not None:
+            return cached
         
         try:
-            url = f"{self.base_url}/v5/market/instruments-info"
-            params = {"category": "linear"}
+            url = query_url(self._url_instruments, category="linear")
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(url, headers=COMPRESSED_HEADERS) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await decode_json(await response.read())
                     if data.get("retCode") == 0 and data.get("result", {}).get("list"):
-                        return [item["symbol"] for item in data["result"]["list"]]
+                        return self._cache_instruments(("linear",), [item["symbol"] for item in data["result"]["list"]])
                 return []
         except Exception as e:
             logger.error(f"Error getting perpetual contracts: {e}")
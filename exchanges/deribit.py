@@ -3,24 +3,46 @@ Deribit exchange integration using public API.
 """
 import aiohttp
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from loguru import logger
+from yarl import URL
 
-from exchanges.base import BaseExchange, OrderBook, Position, MarketData
+from utils.json_codec import dumps, loads
+from exchanges.session import COMPRESSED_HEADERS, get_shared_session, query_url, get_json_with_retry
+from exchanges.base import BaseExchange, OrderBook, Position, MarketData, TopOfBook, _top_of_book
+
+DERIBIT_WS_URL = "wss://www.deribit.com/ws/api/v2"
+INSTRUMENT_FETCH_CONCURRENCY = 8  # Concurrent per-currency instrument requests
+TICKER_MAX_AGE = 5.0  # Seconds a streamed ticker is served before falling back to REST
+TICKER_RECONNECT_DELAY = 1.0  # Initial delay before reopening a dropped ticker stream
+TICKER_RECONNECT_MAX_DELAY = 30.0
 
 class DeribitExchange(BaseExchange):
     """Deribit exchange implementation."""
+    __slots__ = ('base_url', 'session', '_url_orderbook', '_url_ticker', '_url_instruments',
+                 '_ws', '_ws_task', '_latest_ticker', '_subscribed', '_pending_subs', '_next_req_id')
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__("Deribit", config)
         self.base_url = "https://www.deribit.com"
         self.session = None
+        # Endpoint URLs are fixed per exchange, so build them once instead of per request
+        self._url_orderbook = URL(f"{self.base_url}/api/v2/public/get_order_book")
+        self._url_ticker = URL(f"{self.base_url}/api/v2/public/ticker")
+        self._url_instruments = URL(f"{self.base_url}/api/v2/public/get_instruments")
+        # Websocket ticker stream: latest pushed MarketData per subscribed instrument
+        self._ws = None
+        self._ws_task = None
+        self._latest_ticker: Dict[str, MarketData] = {}
+        self._subscribed: set = set()  # Instruments the stream (re)subscribes on every connect
+        self._pending_subs: Dict[int, List[str]] = {}  # Subscribe request id -> instruments
+        self._next_req_id = 0
     
     async def connect(self) -> bool:
         """Connect to Deribit API."""
         try:
-            self.session = aiohttp.ClientSession()
+            self.session = get_shared_session()
             # Test connection with a simple API call
             async with self.session.get(f"{self.base_url}/api/v2/public/test") as response:
                 if response.status == 200:
@@ -37,8 +59,9 @@ class DeribitExchange(BaseExchange):
     async def disconnect(self) -> bool:
         """Disconnect from Deribit API."""
         try:
-            if self.session:
-                await self.session.close()
+            await self._close_ticker_stream()
+            # The session is shared with other exchanges; just release our reference
+            self.session = None
             self.is_connected = False
             logger.info(f"Disconnected from {self.name}")
             return True
@@ -52,75 +75,244 @@ class DeribitExchange(BaseExchange):
             return None
         
         try:
-            url = f"{self.base_url}/api/v2/public/get_order_book"
-            params = {
-                "instrument_name": symbol,
-                "depth": depth
-            }
+            url = query_url(self._url_orderbook, instrument_name=symbol, depth=depth)
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(url) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = loads(await response.read())
                     if data.get("result"):
                         orderbook_data = data["result"]
                         
-                        bids = [
-                            {"price": float(bid[0]), "size": float(bid[1])}
-                            for bid in orderbook_data.get("bids", [])
-                        ]
-                        asks = [
-                            {"price": float(ask[0]), "size": float(ask[1])}
-                            for ask in orderbook_data.get("asks", [])
-                        ]
-                        
-                        return OrderBook(
+                        return OrderBook.from_levels(
                             symbol=symbol,
-                            bids=bids,
-                            asks=asks,
-                            timestamp=datetime.fromtimestamp(int(orderbook_data.get("timestamp", 0)) / 1000),
+                            bids=orderbook_data.get("bids", []),
+                            asks=orderbook_data.get("asks", []),
+                            timestamp_ms=int(orderbook_data.get("timestamp", 0)),
                             exchange=self.name
                         )
                 else:
-                    logger.error(f"Failed to get orderbook for {symbol}: {response.status}")
+                    logger.error("Failed to get orderbook for {}: {}", symbol, response.status)
                     return None
         except Exception as e:
-            logger.error(f"Error getting orderbook for {symbol}: {e}")
+            logger.error("Error getting orderbook for {}: {}", symbol, e)
+            return None
+    
+    async def get_top_of_book(self, symbol: str) -> Optional[TopOfBook]:
+        """Get best bid/ask price and size from a depth-1 book without building an OrderBook."""
+        if not self.is_connected:
+            return None
+        
+        try:
+            url = query_url(self._url_orderbook, instrument_name=symbol, depth=1)
+            
+            async with self.session.get(url) as response:
+                if response.status == 200:
+                    result = loads(await response.read()).get("result")
+                    if result:
+                        return _top_of_book(result.get("bids"), result.get("asks"))
+                else:
+                    logger.error("Failed to get top of book for {}: {}", symbol, response.status)
+                return None
+        except Exception as e:
+            logger.error("Error getting top of book for {}: {}", symbol, e)
             return None
     
+    def _ticker_to_market_data(self, symbol: str, ticker_data: Dict[str, Any]) -> MarketData:
+        """Build MarketData from a Deribit ticker payload (REST result or websocket notification)."""
+        return MarketData(
+            symbol=symbol,
+            price=float(ticker_data.get("last_price", 0)),
+            volume_24h=float(ticker_data.get("volume_24h", 0)),
+            change_24h=float(ticker_data.get("price_change_24h", 0)),
+            timestamp=datetime.fromtimestamp(int(ticker_data.get("timestamp", 0)) / 1000),
+            exchange=self.name
+        )
+    
+    async def subscribe_tickers(self, symbols: List[str]) -> bool:
+        """
+        Stream ticker updates for symbols over one websocket instead of polling REST.
+        
+        Symbols already subscribed are skipped, so this is cheap to call every
+        polling tick. The stream runs in a background task that reconnects and
+        resubscribes if the socket drops; while it is down, or if the exchange
+        rejects a channel, get_market_data falls back to REST.
+        """
+        if not self.is_connected or not symbols:
+            return False
+        
+        try:
+            new = [symbol for symbol in symbols if symbol not in self._subscribed]
+            self._subscribed.update(new)
+            if self._ws_task is None or self._ws_task.done():
+                # The stream subscribes everything in _subscribed once connected
+                self._ws_task = asyncio.create_task(self._run_ticker_stream())
+            elif new and self._ws is not None and not self._ws.closed:
+                await self._send_subscribe(self._ws, new)
+            return True
+        except Exception as e:
+            logger.error("Error subscribing to Deribit tickers: {}", e)
+            return False
+    
+    async def unsubscribe_tickers(self, symbols: List[str]) -> bool:
+        """
+        Stop streaming tickers for symbols, so reconnects no longer resubscribe them.
+        
+        The stream closes once no instruments remain subscribed.
+        """
+        stale = [symbol for symbol in symbols if symbol in self._subscribed]
+        if not stale:
+            return True
+        
+        try:
+            self._subscribed.difference_update(stale)
+            for symbol in stale:
+                self._latest_ticker.pop(symbol, None)
+            ws = self._ws
+            if ws is not None and not ws.closed:
+                if self._subscribed:
+                    self._next_req_id += 1
+                    await ws.send_str(dumps({
+                        "jsonrpc": "2.0",
+                        "id": self._next_req_id,
+                        "method": "public/unsubscribe",
+                        "params": {"channels": [f"ticker.{symbol}.100ms" for symbol in stale]}
+                    }))
+                else:
+                    await ws.close()
+            return True
+        except Exception as e:
+            logger.error("Error unsubscribing from Deribit tickers: {}", e)
+            return False
+    
+    async def _send_subscribe(self, ws: aiohttp.ClientWebSocketResponse, symbols: List[str]):
+        """Request ticker channels for symbols; the reply is checked by _handle_subscribe_reply."""
+        self._next_req_id += 1
+        self._pending_subs[self._next_req_id] = list(symbols)
+        await ws.send_str(dumps({
+            "jsonrpc": "2.0",
+            "id": self._next_req_id,
+            "method": "public/subscribe",
+            # Raw-interval ticker channels need an authenticated connection; 100ms ones don't
+            "params": {"channels": [f"ticker.{symbol}.100ms" for symbol in symbols]}
+        }))
+    
+    def _handle_subscribe_reply(self, data: Dict[str, Any]):
+        """Drop instruments whose subscription was rejected, so later calls retry them."""
+        symbols = self._pending_subs.pop(data.get("id"), None)
+        if symbols is None:
+            return
+        if "error" in data:
+            logger.error("Deribit ticker subscription rejected for {}: {}", symbols, data["error"])
+            self._subscribed.difference_update(symbols)
+            return
+        confirmed = set(data.get("result") or ())
+        rejected = [symbol for symbol in symbols if f"ticker.{symbol}.100ms" not in confirmed]
+        if rejected:
+            logger.warning("Deribit did not confirm ticker subscription for {}", rejected)
+            self._subscribed.difference_update(rejected)
+    
+    async def _run_ticker_stream(self):
+        """Keep the ticker websocket open, reconnecting with backoff and resubscribing on each connect."""
+        delay = TICKER_RECONNECT_DELAY
+        while self.is_connected and self._subscribed:
+            try:
+                ws = await self.session.ws_connect(DERIBIT_WS_URL, heartbeat=30)
+            except Exception as e:
+                logger.error("Error opening Deribit ticker stream: {}", e)
+            else:
+                self._ws = ws
+                try:
+                    await self._send_subscribe(ws, sorted(self._subscribed))
+                    if await self._read_ticker_stream(ws):
+                        # Only a stream that delivered tickers resets the backoff
+                        delay = TICKER_RECONNECT_DELAY
+                finally:
+                    self._ws = None
+                    self._pending_subs.clear()
+                    if not ws.closed:
+                        await ws.close()
+            if not self.is_connected or not self._subscribed:
+                break
+            logger.warning("Deribit ticker stream closed - reconnecting in {:.0f}s", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, TICKER_RECONNECT_MAX_DELAY)
+    
+    async def _read_ticker_stream(self, ws: aiohttp.ClientWebSocketResponse) -> bool:
+        """Apply pushed ticker notifications to _latest_ticker until the websocket closes.
+        
+        Returns True if at least one ticker was received.
+        """
+        received = False
+        try:
+            async for msg in ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    if msg.type == aiohttp.WSMsgType.ERROR:
+                        break
+                    continue
+                data = loads(msg.data)
+                if "id" in data:
+                    self._handle_subscribe_reply(data)
+                    continue
+                if data.get("method") != "subscription":
+                    continue
+                ticker_data = data["params"]["data"]
+                symbol = ticker_data["instrument_name"]
+                self._latest_ticker[symbol] = self._ticker_to_market_data(symbol, ticker_data)
+                received = True
+        except Exception as e:
+            logger.error("Deribit ticker stream error: {}", e)
+        finally:
+            # Streamed values would go stale; let get_market_data fall back to REST
+            self._latest_ticker.clear()
+        return received
+    
+    async def _close_ticker_stream(self):
+        """Stop the ticker stream task and close its websocket."""
+        task, self._ws_task = self._ws_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        self._ws = None
+        self._subscribed.clear()
+        self._pending_subs.clear()
+        self._latest_ticker.clear()
+    
     async def get_market_data(self, symbol: str) -> Optional[MarketData]:
-        """Get market data for a symbol."""
+        """Get market data for a symbol (from the ticker stream when subscribed)."""
         if not self.is_connected:
             return None
         
+        streamed = self._latest_ticker.get(symbol)
+        if streamed is not None:
+            if (datetime.now() - streamed.timestamp).total_seconds() <= TICKER_MAX_AGE:
+                return streamed
+            # No push for this instrument lately; don't serve its last price indefinitely
+            self._latest_ticker.pop(symbol, None)
+        
         try:
-            url = f"{self.base_url}/api/v2/public/ticker"
-            params = {"instrument_name": symbol}
+            url = query_url(self._url_ticker, instrument_name=symbol)
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(url) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = loads(await response.read())
                     if data.get("result"):
-                        ticker_data = data["result"]
-                        
-                        return MarketData(
-                            symbol=symbol,
-                            price=float(ticker_data.get("last_price", 0)),
-                            volume_24h=float(ticker_data.get("volume_24h", 0)),
-                            change_24h=float(ticker_data.get("price_change_24h", 0)),
-                            timestamp=datetime.fromtimestamp(int(ticker_data.get("timestamp", 0)) / 1000),
-                            exchange=self.name
-                        )
+                        return self._ticker_to_market_data(symbol, data["result"])
                 else:
-                    logger.error(f"Failed to get market data for {symbol}: {response.status}")
+                    logger.error("Failed to get market data for {}: {}", symbol, response.status)
                     return None
         except Exception as e:
-            logger.error(f"Error getting market data for {symbol}: {e}")
+            logger.error("Error getting market data for {}: {}", symbol, e)
             return None
     
     async def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
         """Get current positions (requires authentication)."""
         if not self.config.get("api_key") or not self.config.get("secret"):
-            logger.warning("Deribit API credentials not configured - returning empty list")
+            self._warn_auth_once("Deribit API credentials not configured - returning empty list")
             return []
         
         try:
@@ -153,13 +345,13 @@ class DeribitExchange(BaseExchange):
     
     async def cancel_order(self, order_id: str, symbol: str) -> bool:
         """Cancel an order (requires authentication)."""
-        logger.warning("Order cancellation requires authentication - not implemented for demo")
+        self._warn_auth_once("Order cancellation requires authentication - not implemented for demo")
         return False
     
     async def get_balance(self, currency: str) -> float:
         """Get balance for a currency (requires authentication)."""
         if not self.config.get("api_key") or not self.config.get("secret"):
-            logger.warning("Deribit API credentials not configured - returning 0")
+            self._warn_auth_once("Deribit API credentials not configured - returning 0")
             return 0.0
         
         try:
@@ -172,56 +364,65 @@ class DeribitExchange(BaseExchange):
             return 0.0
     
     async def get_instruments(self, currency: str = "BTC") -> List[str]:
-        """Get available instruments for a currency."""
+        """Get available instruments for a currency (cached for INSTRUMENT_CACHE_TTL)."""
         if not self.is_connected:
             return []
+        key = ("instruments", currency)
+        cached = self._get_cached_instruments(key)
+        if cached is not None:
+            return cached
         
         try:
-            url = f"{self.base_url}/api/v2/public/get_instruments"
-            params = {
-                "currency": currency,
-                "expired": "false"
-            }
+            url = query_url(self._url_instruments, currency=currency, expired="false")
             
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get("result"):
-                        return [item["instrument_name"] for item in data["result"]]
-                return []
+            # Transient errors are retried with backoff instead of tearing down the shared session
+            _, data = await get_json_with_retry(self.session, url, headers=COMPRESSED_HEADERS,
+                                                offload_decode=True)
+            if data and data.get("result"):
+                return self._cache_instruments(key, [item["instrument_name"] for item in data["result"]])
+            return []
         except Exception as e:
             logger.error(f"Error getting instruments: {e}")
-            if self.session:
-                await self.session.close()
             return []
     
+    async def get_all_instruments(self, currencies: Tuple[str, ...] = ("BTC", "ETH", "SOL")) -> Dict[str, List[str]]:
+        """Get instruments for several currencies concurrently, as {currency: [instrument names]}."""
+        sem = asyncio.Semaphore(INSTRUMENT_FETCH_CONCURRENCY)
+        
+        async def fetch(currency: str) -> List[str]:
+            async with sem:
+                return await self.get_instruments(currency)
+        
+        # get_instruments handles its own errors, so one failing currency can't cancel the group
+        async with asyncio.TaskGroup() as tg:
+            tasks = {currency: tg.create_task(fetch(currency)) for currency in currencies}
+        return {currency: task.result() for currency, task in tasks.items()}
+    
     async def get_options_chain(self, underlying: str, expiration_date: str) -> List[str]:
-        """Get options chain for a specific underlying and expiration."""
+        """Get options chain for a specific underlying and expiration (cached for INSTRUMENT_CACHE_TTL)."""
         if not self.is_connected:
             return []
+        key = ("options", underlying, expiration_date)
+        cached = self._get_cached_instruments(key)
+        if cached is not None:
+            return cached
         
         try:
-            url = f"{self.base_url}/api/v2/public/get_instruments"
-            params = {
-                "currency": underlying,
-                "expired": "false",
-                "kind": "option"
-            }
+            url = query_url(self._url_instruments, currency=underlying, expired="false", kind="option")
             
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data.get("result"):
-                        # Filter by expiration date
-                        options = [
-                            item["instrument_name"] 
-                            for item in data["result"] 
-                            if expiration_date in item["instrument_name"]
-                        ]
-                        return options
-                return []
+            # Transient errors are retried with backoff instead of tearing down the shared session
+            _, data = await get_json_with_retry(self.session, url, headers=COMPRESSED_HEADERS,
+                                                offload_decode=True)
+            if data and data.get("result"):
+                # Filter by expiration date; names look like BTC-27DEC24-50000-C, so match
+                # the delimited expiry segment rather than any substring (e.g. of a strike)
+                needle = f"-{expiration_date}-"
+                options = [
+                    name for name in (item["instrument_name"] for item in data["result"])
+                    if needle in name
+                ]
+                return self._cache_instruments(key, options)
+            return []
         except Exception as e:
             logger.error(f"Error getting options chain: {e}")
-            if self.session:
-                await self.session.close()
             return [] 
\ No newline at end of file
@@ -1,26 +1,33 @@
 """
 OKX exchange integration using public API.
 """
-import aiohttp
 import asyncio
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from loguru import logger
+from yarl import URL
 
+from utils.json_codec import loads
+from exchanges.session import COMPRESSED_HEADERS, decode_json, get_shared_session, query_url
 from exchanges.base import BaseExchange, OrderBook, Position, MarketData
 
 class OKXExchange(BaseExchange):
     """OKX exchange implementation."""
+    __slots__ = ('base_url', 'session', '_url_books', '_url_ticker', '_url_instruments')
     
     def __init__(self, config: Dict[str, Any]):
         super().__init__("OKX", config)
         self.base_url = "https://www.okx.com"
         self.session = None
+        # Endpoint URLs are fixed per exchange, so build them once instead of per request
+        self._url_books = URL(f"{self.base_url}/api/v5/market/books")
+        self._url_ticker = URL(f"{self.base_url}/api/v5/market/ticker")
+        self._url_instruments = URL(f"{self.base_url}/api/v5/public/instruments")
     
     async def connect(self) -> bool:
         """Connect to OKX API."""
         try:
-            self.session = aiohttp.ClientSession()
+            self.session = get_shared_session()
             # Test connection with a simple API call
             async with self.session.get(f"{self.base_url}/api/v5/public/time") as response:
                 if response.status == 200:
@@ -37,8 +44,8 @@ class OKXExchange(BaseExchange):
     async def disconnect(self) -> bool:
         """Disconnect from OKX API."""
         try:
-            if self.session:
-                await self.session.close()
+            # The session is shared with other exchanges; just release our reference
+            self.session = None
             self.is_connected = False
             logger.info(f"Disconnected from {self.name}")
             return True
@@ -52,39 +59,26 @@ class OKXExchange(BaseExchange):
             return None
         
         try:
-            url = f"{self.base_url}/api/v5/market/books"
-            params = {
-                "instId": symbol,
-                "sz": depth
-            }
+            url = query_url(self._url_books, instId=symbol, sz=depth)
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(url) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = loads(await response.read())
                     if data.get("code") == "0" and data.get("data"):
                         orderbook_data = data["data"][0]
                         
-                        bids = [
-                            {"price": float(bid[0]), "size": float(bid[1])}
-                            for bid in orderbook_data.get("bids", [])
-                        ]
-                        asks = [
-                            {"price": float(ask[0]), "size": float(ask[1])}
-                            for ask in orderbook_data.get("asks", [])
-                        ]
-                        
-                        return OrderBook(
+                        return OrderBook.from_levels(
                             symbol=symbol,
-                            bids=bids,
-                            asks=asks,
-                            timestamp=datetime.fromtimestamp(int(orderbook_data.get("ts", 0)) / 1000),
+                            bids=orderbook_data.get("bids", []),
+                            asks=orderbook_data.get("asks", []),
+                            timestamp_ms=int(orderbook_data.get("ts", 0)),
                             exchange=self.name
                         )
                 else:
-                    logger.error(f"Failed to get orderbook for {symbol}: {response.status}")
+                    logger.error("Failed to get orderbook for {}: {}", symbol, response.status)
                     return None
         except Exception as e:
-            logger.error(f"Error getting orderbook for {symbol}: {e}")
+            logger.error("Error getting orderbook for {}: {}", symbol, e)
             return None
     
     async def get_market_data(self, symbol: str) -> Optional[MarketData]:
@@ -93,12 +87,11 @@ class OKXExchange(BaseExchange):
             return None
         
         try:
-            url = f"{self.base_url}/api/v5/market/ticker"
-            params = {"instId": symbol}
+            url = query_url(self._url_ticker, instId=symbol)
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(url) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = loads(await response.read())
                     if data.get("code") == "0" and data.get("data"):
                         ticker_data = data["data"][0]
                         
@@ -111,48 +104,50 @@ class OKXExchange(BaseExchange):
                             exchange=self.name
                         )
                 else:
-                    logger.error(f"Failed to get market data for {symbol}: {response.status}")
+                    logger.error("Failed to get market data for {}: {}", symbol, response.status)
                     return None
         except Exception as e:
-            logger.error(f"Error getting market data for {symbol}: {e}")
+            logger.error("Error getting market data for {}: {}", symbol, e)
             return None
     
     async def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
         """Get current positions (requires authentication)."""
         # For demo purposes, return empty list since we're using public API
-        logger.warning("Position data requires authentication - returning empty list for demo")
+        self._warn_auth_once("Position data requires authentication - returning empty list for demo")
         return []
     
     async def place_order(self, symbol: str, side: str, size: float, 
                          order_type: str = "market", price: Optional[float] = None) -> Dict[str, Any]:
         """Place an order (requires authentication)."""
-        logger.warning("Order placement requires authentication - not implemented for demo")
+        self._warn_auth_once("Order placement requires authentication - not implemented for demo")
         return {"success": False, "message": "Authentication required"}
     
     async def cancel_order(self, order_id: str, symbol: str) -> bool:
         """Cancel an order (requires authentication)."""
-        logger.warning("Order cancellation requires authentication - not implemented for demo")
+        self._warn_auth_once("Order cancellation requires authentication - not implemented for demo")
         return False
     
     async def get_balance(self, currency: str) -> float:
         """Get balance for a currency (requires authentication)."""
-        logger.warning("Balance data requires authentication - returning 0 for demo")
+        self._warn_auth_once("Balance data requires authentication - returning 0 for demo")
         return 0.0
     
     async def get_perpetual_contracts(self) -> List[str]:
-        """Get available perpetual contract symbols."""
+        """Get available perpetual contract symbols (cached for INSTRUMENT_CACHE_TTL)."""
         if not self.is_connected:
             return []
+        cached = self._get_cached_instruments(("swap",))
+        if cached is not None:
+            return cached
         
         try:
-            url = f"{self.base_url}/api/v5/public/instruments"
-            params = {"instType": "SWAP"}
+            url = query_url(self._url_instruments, instType="SWAP")
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(url, headers=COMPRESSED_HEADERS) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await decode_json(await response.read())
                     if data.get("code") == "0" and data.get("data"):
-                        return [item["instId"] for item in data["data"]]
+                        return self._cache_instruments(("swap",), [item["instId"] for item in data["data"]])
                 return []
         except Exception as e:
             logger.error(f"Error getting perpetual contracts: {e}")
@@ -0,0 +1,86 @@
+"""
+Typed decoders for hot exchange responses.
+
+With msgspec installed, responses are decoded straight into small Structs,
+converting numeric strings to floats while parsing and skipping fields we don't
+use. Without msgspec the same functions fall back to utils.json_codec.loads
+plus dict lookups, so callers get identical results either way.
+"""
+from typing import List, Optional, Tuple
+
+from utils.json_codec import loads
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+# (last price, 24h volume, 24h change, response time in ms)
+TickerFields = Tuple[float, float, float, int]
+# (bid levels, ask levels, book time in ms); levels are [price, size] pairs
+BookFields = Tuple[list, list, int]
+
+if MSGSPEC_AVAILABLE:
+    class _BybitTicker(msgspec.Struct):
+        lastPrice: float = 0.0
+        volume24h: float = 0.0
+        price24hPcnt: float = 0.0
+
+    class _BybitTickerResult(msgspec.Struct):
+        list: List[_BybitTicker] = []
+
+    class _BybitTickerResponse(msgspec.Struct):
+        retCode: int = -1
+        result: Optional[_BybitTickerResult] = None
+        time: int = 0
+
+    class _BybitBook(msgspec.Struct):
+        b: List[Tuple[float, float]] = []
+        a: List[Tuple[float, float]] = []
+        ts: int = 0
+
+    class _BybitBookResponse(msgspec.Struct):
+        retCode: int = -1
+        result: Optional[_BybitBook] = None
+
+    # strict=False lets Bybit's quoted numbers ("67000.5") decode directly into float fields
+    _bybit_ticker_decoder = msgspec.json.Decoder(_BybitTickerResponse, strict=False)
+    _bybit_book_decoder = msgspec.json.Decoder(_BybitBookResponse, strict=False)
+
+
+def decode_bybit_ticker(raw: bytes) -> Optional[TickerFields]:
+    """Decode a Bybit /v5/market/tickers response, returning the first ticker's fields (or None)."""
+    if MSGSPEC_AVAILABLE:
+        msg = _bybit_ticker_decoder.decode(raw)
+        if msg.retCode != 0 or msg.result is None or not msg.result.list:
+            return None
+        ticker = msg.result.list[0]
+        return ticker.lastPrice, ticker.volume24h, ticker.price24hPcnt, msg.time
+
+    data = loads(raw)
+    if data.get("retCode") != 0 or not data.get("result", {}).get("list"):
+        return None
+    ticker = data["result"]["list"][0]
+    return (
+        float(ticker.get("lastPrice", 0)),
+        float(ticker.get("volume24h", 0)),
+        float(ticker.get("price24hPcnt", 0)),
+        int(data.get("time", 0))
+    )
+
+
+def decode_bybit_orderbook(raw: bytes) -> Optional[BookFields]:
+    """Decode a Bybit /v5/market/orderbook response into (bids, asks, ts), or None."""
+    if MSGSPEC_AVAILABLE:
+        msg = _bybit_book_decoder.decode(raw)
+        if msg.retCode != 0 or msg.result is None:
+            return None
+        # Levels arrive as float pairs, so OrderBook.from_levels skips string parsing
+        return msg.result.b, msg.result.a, msg.result.ts
+
+    data = loads(raw)
+    if data.get("retCode") != 0 or not data.get("result"):
+        return None
+    book = data["result"]
+    return book.get("b", []), book.get("a", []), int(book.get("ts", 0))
@@ -0,0 +1,106 @@
+"""
+Shared HTTP session for exchange REST clients.
+
+One aiohttp session (and connection pool) is shared by every exchange adapter
+for the lifetime of the application, so keep-alive connections and cached DNS
+lookups are reused across requests and exchanges. Adapters must not close it;
+call close_shared_session() once at application shutdown.
+"""
+import asyncio
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+import aiohttp
+from yarl import URL
+
+from utils.json_codec import dumps, loads
+
+try:
+    import brotli  # noqa: F401 -- aiohttp decodes br responses once this is importable
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# For large listings (instruments, options chains): brotli shrinks JSON ~20% more than gzip.
+# Only advertise br when we can decode it.
+COMPRESSED_HEADERS = {"Accept-Encoding": "br, gzip" if BROTLI_AVAILABLE else "gzip, deflate"}
+
+# Payloads at least this large are decoded in the default executor instead of on the event loop
+OFFLOAD_DECODE_BYTES = 64 * 1024
+
+# Errors worth retrying: connection resets, DNS hiccups, timeouts
+RETRY_EXCEPTIONS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """Return the application-wide session, creating it on first use (must be called from a coroutine)."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=0,
+            limit_per_host=64,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=5),
+            json_serialize=dumps
+        )
+    return _session
+
+
+@lru_cache(maxsize=4096)
+def query_url(base: URL, **query: Any) -> URL:
+    """
+    Return base with the given query string, memoized per (base, query).
+    
+    Passing the resulting URL to session.get() without params= lets aiohttp skip
+    re-parsing and re-encoding the URL on every poll of the same endpoint/symbol.
+    """
+    return base.with_query(query)
+
+
+async def decode_json(raw: bytes) -> Any:
+    """Decode a JSON body, moving large payloads off the event loop so other polls keep running."""
+    if len(raw) < OFFLOAD_DECODE_BYTES:
+        return loads(raw)
+    return await asyncio.get_running_loop().run_in_executor(None, loads, raw)
+
+
+async def close_shared_session():
+    """Close the shared session, if one was created."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def get_json_with_retry(session: aiohttp.ClientSession, url: Union[str, URL],
+                              params: Optional[Mapping[str, Any]] = None,
+                              headers: Optional[Dict[str, str]] = None,
+                              offload_decode: bool = False,
+                              max_tries: int = 3, base_delay: float = 0.25) -> Tuple[int, Any]:
+    """
+    GET a JSON endpoint, retrying transient client errors with exponential backoff.
+    
+    Returns (status, decoded body); the body is None for non-200 responses.
+    With offload_decode, large bodies are decoded via decode_json().
+    The session itself is never closed here, so one bad request can't take down
+    the pool shared by the other exchanges. Raises the last error once max_tries
+    is exhausted.
+    """
+    for attempt in range(1, max_tries + 1):
+        try:
+            async with session.get(url, params=params, headers=headers) as response:
+                if response.status != 200:
+                    return response.status, None
+                raw = await response.read()
+                return response.status, (await decode_json(raw) if offload_decode else loads(raw))
+        except RETRY_EXCEPTIONS:
+            if attempt == max_tries:
+                raise
+            await asyncio.sleep(base_delay * 2 ** (attempt - 1))
@@ -1,31 +1,65 @@
 """
 Hedging strategy implementations.
 """
-from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import asyncio
+import time
+from functools import lru_cache
+from typing import Dict, Final, List, Optional, Any, Protocol, Sequence, Tuple
+from dataclasses import dataclass, field
+from enum import IntEnum
 from datetime import datetime
+import numpy as np
 from loguru import logger
 
+from utils.jit import NUMBA_AVAILABLE, njit, prange
 from exchanges.base import Position, OrderBook, MarketData
 from risk.calculator import RiskMetrics, HedgeRecommendation
 
-@dataclass
+class Side(IntEnum):
+    """Order side; compared as an int, use HedgeOrder.side_str for the wire format."""
+    BUY = 0
+    SELL = 1
+
+class OrderType(IntEnum):
+    """Order type; compared as an int, use HedgeOrder.order_type_str for the wire format."""
+    MARKET = 0
+    LIMIT = 1
+
+_SIDE_STR = ("buy", "sell")
+_ORDER_TYPE_STR = ("market", "limit")
+
+@dataclass(slots=True, frozen=True)
 class HedgeOrder:
-    """Hedge order data structure."""
+    """Hedge order data structure (side/order_type also accept 'buy'/'sell', 'market'/'limit')."""
     symbol: str
-    side: str  # 'buy' or 'sell'
+    side: Side
     size: float
-    order_type: str  # 'market' or 'limit'
+    order_type: OrderType
     price: Optional[float] = None
     exchange: str = ""
-    timestamp: datetime = None
+    # Creation time as epoch nanoseconds; the datetime is only built when read
+    timestamp_ns: int = field(default_factory=time.time_ns)
     
     def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+        # Unknown strings are kept as-is so validate_hedge can reject them
+        if isinstance(self.side, str):
+            object.__setattr__(self, 'side', Side.__members__.get(self.side.upper(), self.side))
+        if isinstance(self.order_type, str):
+            object.__setattr__(self, 'order_type', OrderType.__members__.get(self.order_type.upper(), self.order_type))
+    
+    @property
+    def side_str(self) -> str:
+        return _SIDE_STR[self.side]
+    
+    @property
+    def order_type_str(self) -> str:
+        return _ORDER_TYPE_STR[self.order_type]
+    
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HedgeResult:
     """Hedge execution result."""
     success: bool
@@ -33,29 +67,150 @@ class HedgeResult:
     total_cost: float
     execution_time: float
     message: str
-    timestamp: datetime = None
+    # Creation time as epoch nanoseconds; the datetime is only built when read
+    timestamp_ns: int = field(default_factory=time.time_ns)
     
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
 
-class BaseHedgingStrategy(ABC):
-    """Base class for all hedging strategies."""
+@lru_cache(maxsize=256)
+def _perp_symbol(symbol: str) -> str:
+    """Perpetual hedge instrument for a position symbol, built once per distinct symbol."""
+    return f"{symbol}-PERP"
+
+@lru_cache(maxsize=256)
+def _option_symbol(symbol: str, option_type: str) -> str:
+    """Option hedge instrument for a position symbol and option type, built once per pair."""
+    return f"{symbol}-{option_type.upper()}"
+
+@njit(cache=True, parallel=True)
+def _hedge_kernel_jit(sizes, prices, deltas, is_long, bids, asks, gated, threshold, target, band, max_size):
+    """
+    Per-position hedge size, side, price and trigger flag in one fused, parallel pass.
     
-    def __init__(self, name: str):
-        self.name = name
-        self.is_active = False
+    Mirrors the scalar calculate_hedge paths: size is |delta| capped at max_size,
+    price is the bid/ask mid (market price for a NaN side), longs are hedged with
+    sells. With gated set, only non-zero positions whose hedge ratio is outside the
+    rebalance band trigger (absolute threshold when target is 0); otherwise all do.
+    No fastmath: it would let the compiler assume away the NaN checks.
+    """
+    n = deltas.shape[0]
+    out_size = np.empty(n)
+    out_side = np.empty(n, dtype=np.int8)
+    out_price = np.empty(n)
+    trigger = np.empty(n, dtype=np.bool_)
+    for i in prange(n):
+        abs_delta = abs(deltas[i])
+        out_size[i] = min(abs_delta, max_size)
+        out_side[i] = 1 if is_long[i] else 0  # Side.SELL / Side.BUY
+        bid = prices[i] if np.isnan(bids[i]) else bids[i]
+        ask = prices[i] if np.isnan(asks[i]) else asks[i]
+        out_price[i] = 0.5 * (bid + ask)
+        if not gated:
+            trigger[i] = True
+        else:
+            value = sizes[i] * prices[i]
+            if value == 0.0:
+                trigger[i] = False
+            elif target == 0.0:
+                trigger[i] = abs_delta / value >= threshold
+            else:
+                trigger[i] = abs(abs_delta / value - target) > band
+    return out_size, out_side, out_price, trigger
+
+def _hedge_kernel_numpy(sizes, prices, deltas, is_long, bids, asks, gated, threshold, target, band, max_size):
+    """Vectorized NumPy equivalent of _hedge_kernel_jit, used when Numba is not installed."""
+    abs_deltas = np.abs(deltas)
+    out_size = np.minimum(abs_deltas, max_size)
+    out_side = is_long.astype(np.int8)  # Side.SELL (1) for longs, Side.BUY (0) for shorts
+    out_price = 0.5 * (np.where(np.isnan(bids), prices, bids) + np.where(np.isnan(asks), prices, asks))
+    if not gated:
+        return out_size, out_side, out_price, np.ones(deltas.shape[0], dtype=np.bool_)
+    values = sizes * prices
+    ratios = np.divide(abs_deltas, values, out=np.zeros_like(abs_deltas), where=values != 0)
+    if target == 0.0:
+        outside = ratios >= threshold
+    else:
+        outside = np.abs(ratios - target) > band
+    return out_size, out_side, out_price, outside & (values != 0)
+
+# Compiled loop when Numba is available; without it the plain loop would be slower than NumPy
+_hedge_kernel = _hedge_kernel_jit if NUMBA_AVAILABLE else _hedge_kernel_numpy
+
+def _batch_hedge_orders(positions: Sequence[Position], deltas: Sequence[float], market_prices: Sequence[float],
+                        best_bids: Optional[Sequence[float]], best_asks: Optional[Sequence[float]],
+                        exchange: str, gated: bool = False, threshold: float = 0.0, target: float = 0.0,
+                        band: float = 0.0, max_size: float = np.inf) -> List[HedgeOrder]:
+    """Run _hedge_kernel over SoA arrays built from positions and wrap the triggered rows as perpetual HedgeOrders."""
+    n = len(positions)
+    prices = np.ascontiguousarray(market_prices, dtype=np.float64)
+    nan = np.full(n, np.nan)
+    bids = nan if best_bids is None else np.ascontiguousarray(best_bids, dtype=np.float64)
+    asks = nan if best_asks is None else np.ascontiguousarray(best_asks, dtype=np.float64)
+    sizes = np.fromiter((p.size for p in positions), dtype=np.float64, count=n)
+    is_long = np.fromiter((p.side == "long" for p in positions), dtype=np.bool_, count=n)
+    out_size, out_side, out_price, trigger = _hedge_kernel(
+        sizes, prices, np.ascontiguousarray(deltas, dtype=np.float64), is_long, bids, asks,
+        gated, threshold, target, band, max_size
+    )
+    rows = np.flatnonzero(trigger)
+    return [
+        HedgeOrder(
+            symbol=_perp_symbol(positions[i].symbol),
+            side=Side(side),
+            size=size,
+            order_type=OrderType.MARKET,
+            price=price,
+            exchange=exchange
+        )
+        for i, side, size, price in zip(rows.tolist(), out_side[rows].tolist(),
+                                        out_size[rows].tolist(), out_price[rows].tolist())
+    ]
+
+# Concurrent order submissions per exchange (stays under typical ~10 orders/s limits)
+HEDGE_EXECUTION_CONCURRENCY = 8
+
+# (position side, hedge side) pairs that reduce exposure
+_VALID_HEDGE = frozenset({("long", Side.SELL), ("short", Side.BUY)})
+_HEDGE_SIDES = frozenset(Side)
+
+class HedgingStrategy(Protocol):
+    """Interface every hedging strategy provides (checked statically, no runtime ABC machinery)."""
+    name: str
     
-    @abstractmethod
     async def calculate_hedge(self, position: Position, risk_metrics: RiskMetrics,
                             market_data: MarketData, orderbook: OrderBook) -> Optional[HedgeOrder]:
         """Calculate hedge order for a position."""
-        pass
+        ...
     
-    @abstractmethod
     async def execute_hedge(self, hedge_order: HedgeOrder, exchange, position: Position = None) -> HedgeResult:
         """Execute hedge order."""
-        pass
+        ...
+
+class BaseHedgingStrategy:
+    """Plain base class with shared helpers for the built-in strategies (see HedgingStrategy)."""
+    _COST_RATE: float = 0.0  # Execution cost as a fraction of notional
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.is_active = False
+    
+    def _mid_price_and_side(self, position: Position, market_data: MarketData,
+                            orderbook: OrderBook) -> Tuple[float, Side]:
+        """Perpetual hedge price (book mid, else market price) and side (sell for longs, buy for shorts)."""
+        if orderbook:
+            _, _, hedge_price = orderbook.top(market_data.price)
+        else:
+            hedge_price = market_data.price
+        return hedge_price, Side.SELL if position.side == "long" else Side.BUY
+    
+    def estimate_batch_cost(self, orders: Sequence[HedgeOrder]) -> float:
+        """Total execution cost of many orders, computed in one NumPy pass."""
+        n = len(orders)
+        sizes = np.fromiter((o.size for o in orders), dtype=np.float64, count=n)
+        prices = np.fromiter((o.price for o in orders), dtype=np.float64, count=n)
+        return float(sizes @ prices) * self._COST_RATE
     
     def validate_hedge(self, hedge_order: HedgeOrder, position: Position) -> bool:
         """Validate hedge order."""
@@ -69,19 +224,15 @@ class BaseHedgingStrategy(ABC):
                 logger.warning("Hedge size must be positive")
                 return False
             
-            if hedge_order.side not in ['buy', 'sell']:
+            if hedge_order.side not in _HEDGE_SIDES:
                 logger.warning("Invalid hedge side")
                 return False
             
             # Check if hedge direction is correct (only if position is provided)
-            if position is not None and hasattr(position, 'side'):
-                if position.side == "long" and hedge_order.side == "buy":
-                    logger.warning("Long position should be hedged with sell order")
-                    return False
-                
-                if position.side == "short" and hedge_order.side == "sell":
-                    logger.warning("Short position should be hedged with buy order")
-                    return False
+            position_side = getattr(position, 'side', None)
+            if position_side is not None and (position_side, hedge_order.side) not in _VALID_HEDGE:
+                logger.warning(f"{position_side.capitalize()} position can't be hedged with a {hedge_order.side_str} order")
+                return False
             
             return True
         except Exception as e:
@@ -90,6 +241,7 @@ class BaseHedgingStrategy(ABC):
 
 class DeltaNeutralStrategy(BaseHedgingStrategy):
     """Delta-neutral hedging strategy using perpetual futures."""
+    _COST_RATE: Final[float] = 0.0005  # 0.05% cost
     
     def __init__(self):
         super().__init__("Delta Neutral")
@@ -102,41 +254,47 @@ class DeltaNeutralStrategy(BaseHedgingStrategy):
             # Calculate required hedge size
             required_hedge_size = abs(risk_metrics.delta)
             
-            # Determine hedge side
-            if position.side == "long":
-                hedge_side = "sell"  # Short hedge for long position
-            else:
-                hedge_side = "buy"   # Long hedge for short position
-            
-            # Calculate hedge price (mid price from orderbook)
-            if orderbook:
-                best_bid = orderbook.bids[0]['price'] if orderbook.bids else market_data.price
-                best_ask = orderbook.asks[0]['price'] if orderbook.asks else market_data.price
-                hedge_price = (best_bid + best_ask) / 2
-            else:
-                hedge_price = market_data.price
+            # Hedge at the book mid, against the position's direction
+            hedge_price, hedge_side = self._mid_price_and_side(position, market_data, orderbook)
             
             # Create hedge order
             hedge_order = HedgeOrder(
-                symbol=f"{position.symbol}-PERP",
+                symbol=_perp_symbol(position.symbol),
                 side=hedge_side,
                 size=required_hedge_size,
-                order_type="market",
+                order_type=OrderType.MARKET,
                 price=hedge_price,
                 exchange=market_data.exchange
             )
             
-            logger.info(f"Calculated delta-neutral hedge: {hedge_side} {required_hedge_size} {hedge_order.symbol}")
+            logger.info(f"Calculated delta-neutral hedge: {hedge_order.side_str} {required_hedge_size} {hedge_order.symbol}")
             return hedge_order
             
         except Exception as e:
             logger.error(f"Error calculating delta-neutral hedge: {e}")
             return None
     
+    def calculate_hedge_batch(self, positions: Sequence[Position], deltas: Sequence[float],
+                              market_prices: Sequence[float], best_bids: Optional[Sequence[float]] = None,
+                              best_asks: Optional[Sequence[float]] = None, exchange: str = "") -> List[HedgeOrder]:
+        """
+        Vectorized calculate_hedge over many positions.
+        
+        deltas, market_prices and (optional) best_bids/best_asks are aligned with
+        positions; use NaN for a missing bid/ask. Returns one order per position.
+        """
+        try:
+            if not len(positions):
+                return []
+            return _batch_hedge_orders(positions, deltas, market_prices, best_bids, best_asks, exchange)
+        except Exception as e:
+            logger.error(f"Error calculating delta-neutral hedge batch: {e}")
+            return []
+    
     async def execute_hedge(self, hedge_order: HedgeOrder, exchange, position: Position = None) -> HedgeResult:
         """Execute delta-neutral hedge."""
         try:
-            start_time = datetime.now()
+            t0 = time.perf_counter_ns()
             
             # Validate hedge order
             if not self.validate_hedge(hedge_order, position):
@@ -149,12 +307,12 @@ class DeltaNeutralStrategy(BaseHedgingStrategy):
                 )
             
             # Execute order (simulated for demo)
-            logger.info(f"Executing delta-neutral hedge: {hedge_order.side} {hedge_order.size} {hedge_order.symbol}")
+            logger.info(f"Executing delta-neutral hedge: {hedge_order.side_str} {hedge_order.size} {hedge_order.symbol}")
             
             # Calculate execution cost
-            execution_cost = hedge_order.size * hedge_order.price * 0.0005  # 0.05% cost
+            execution_cost = hedge_order.size * hedge_order.price * self._COST_RATE
             
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = (time.perf_counter_ns() - t0) * 1e-9
             
             return HedgeResult(
                 success=True,
@@ -176,6 +334,7 @@ class DeltaNeutralStrategy(BaseHedgingStrategy):
 
 class OptionsHedgingStrategy(BaseHedgingStrategy):
     """Options-based hedging strategy."""
+    _COST_RATE: Final[float] = 0.02  # 2% cost for options
     
     def __init__(self):
         super().__init__("Options Hedging")
@@ -188,10 +347,10 @@ class OptionsHedgingStrategy(BaseHedgingStrategy):
             # Determine option type based on position and risk
             if position.side == "long":
                 option_type = "protective_put"
-                hedge_side = "buy"
+                hedge_side = Side.BUY
             else:
                 option_type = "covered_call"
-                hedge_side = "sell"
+                hedge_side = Side.SELL
             
             # Calculate option size (simplified)
             option_size = abs(risk_metrics.delta)
@@ -201,15 +360,15 @@ class OptionsHedgingStrategy(BaseHedgingStrategy):
             
             # Create hedge order
             hedge_order = HedgeOrder(
-                symbol=f"{position.symbol}-{option_type.upper()}",
+                symbol=_option_symbol(position.symbol, option_type),
                 side=hedge_side,
                 size=option_size,
-                order_type="market",
+                order_type=OrderType.MARKET,
                 price=option_price,
                 exchange=market_data.exchange
             )
             
-            logger.info(f"Calculated options hedge: {hedge_side} {option_size} {hedge_order.symbol}")
+            logger.info(f"Calculated options hedge: {hedge_order.side_str} {option_size} {hedge_order.symbol}")
             return hedge_order
             
         except Exception as e:
@@ -219,7 +378,7 @@ class OptionsHedgingStrategy(BaseHedgingStrategy):
     async def execute_hedge(self, hedge_order: HedgeOrder, exchange, position: Position = None) -> HedgeResult:
         """Execute options hedge."""
         try:
-            start_time = datetime.now()
+            t0 = time.perf_counter_ns()
             
             # Validate hedge order
             if not self.validate_hedge(hedge_order, position):
@@ -232,12 +391,12 @@ class OptionsHedgingStrategy(BaseHedgingStrategy):
                 )
             
             # Execute order (simulated for demo)
-            logger.info(f"Executing options hedge: {hedge_order.side} {hedge_order.size} {hedge_order.symbol}")
+            logger.info(f"Executing options hedge: {hedge_order.side_str} {hedge_order.size} {hedge_order.symbol}")
             
             # Calculate execution cost
-            execution_cost = hedge_order.size * hedge_order.price * 0.02  # 2% cost for options
+            execution_cost = hedge_order.size * hedge_order.price * self._COST_RATE
             
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = (time.perf_counter_ns() - t0) * 1e-9
             
             return HedgeResult(
                 success=True,
@@ -257,65 +416,125 @@ class OptionsHedgingStrategy(BaseHedgingStrategy):
                 message=f"Error: {str(e)}"
             )
 
+class _CompiledParam:
+    """Strategy parameter whose assignment re-runs the owner's _compile()."""
+    
+    def __set_name__(self, owner, name):
+        self._attr = f"_{name}"
+    
+    def __get__(self, obj, objtype=None):
+        return self if obj is None else getattr(obj, self._attr)
+    
+    def __set__(self, obj, value):
+        setattr(obj, self._attr, value)
+        # Skip while __init__ is still assigning the other parameters
+        if hasattr(obj, '_params'):
+            obj._compile()
+
 class DynamicHedgingStrategy(BaseHedgingStrategy):
     """Dynamic hedging strategy with rebalancing."""
+    _COST_RATE: Final[float] = 0.0005  # 0.05% cost
     
-    def __init__(self):
+    rebalance_threshold = _CompiledParam()
+    max_hedge_size = _CompiledParam()
+    target_hedge_ratio = _CompiledParam()
+    band_pp = _CompiledParam()
+    
+    def __init__(self, target_hedge_ratio: float = 0.0, band_pp: float = 0.15):
         super().__init__("Dynamic Hedging")
         self.rebalance_threshold = 0.05  # 5% threshold for rebalancing
         self.max_hedge_size = 1000000  # Maximum hedge size in USD
+        # Band rebalancing: only trade once the hedge ratio drifts more than band_pp
+        # away from target_hedge_ratio. A zero target falls back to rebalance_threshold.
+        self.target_hedge_ratio = target_hedge_ratio
+        self.band_pp = band_pp
+        self._compile()
+    
+    def _compile(self):
+        """
+        Specialize the rebalance gate and size cap for the current parameters.
+        
+        The parameters are bound as closure constants, so calculate_hedge skips the
+        attribute loads and the zero-target branch. Assigning any parameter calls
+        this again, and calculate_hedge_batch reads the same snapshot (_params),
+        so the scalar and batch paths always agree.
+        """
+        threshold = self.rebalance_threshold
+        target = self.target_hedge_ratio
+        band = self.band_pp
+        max_size = self.max_hedge_size
+        self._params = (threshold, target, band, float(max_size))
+        
+        if target == 0:
+            def hedge_size(abs_delta: float, position_value: float) -> Optional[float]:
+                if abs_delta / position_value < threshold:
+                    return None
+                return min(abs_delta, max_size)
+        else:
+            def hedge_size(abs_delta: float, position_value: float) -> Optional[float]:
+                if abs(abs_delta / position_value - target) <= band:
+                    return None
+                return min(abs_delta, max_size)
+        
+        # Required hedge size, or None while the hedge ratio is inside the rebalance band
+        self._hedge_size = hedge_size
     
     async def calculate_hedge(self, position: Position, risk_metrics: RiskMetrics,
                             market_data: MarketData, orderbook: OrderBook) -> Optional[HedgeOrder]:
         """Calculate dynamic hedge."""
         try:
-            # Calculate current hedge ratio
-            position_value = position.size * market_data.price
-            current_hedge_ratio = abs(risk_metrics.delta) / position_value
-            
-            # Check if rebalancing is needed
-            if current_hedge_ratio < self.rebalance_threshold:
-                logger.info("Hedge ratio below threshold, no rebalancing needed")
+            # Check if rebalancing is needed and size the hedge
+            required_hedge_size = self._hedge_size(abs(risk_metrics.delta), position.size * market_data.price)
+            if required_hedge_size is None:
+                logger.info("Hedge ratio within rebalance band, no rebalancing needed")
                 return None
             
-            # Calculate required hedge size
-            required_hedge_size = min(abs(risk_metrics.delta), self.max_hedge_size)
-            
-            # Determine hedge side
-            if position.side == "long":
-                hedge_side = "sell"
-            else:
-                hedge_side = "buy"
-            
-            # Calculate hedge price
-            if orderbook:
-                best_bid = orderbook.bids[0]['price'] if orderbook.bids else market_data.price
-                best_ask = orderbook.asks[0]['price'] if orderbook.asks else market_data.price
-                hedge_price = (best_bid + best_ask) / 2
-            else:
-                hedge_price = market_data.price
+            # Hedge at the book mid, against the position's direction
+            hedge_price, hedge_side = self._mid_price_and_side(position, market_data, orderbook)
             
             # Create hedge order
             hedge_order = HedgeOrder(
-                symbol=f"{position.symbol}-PERP",
+                symbol=_perp_symbol(position.symbol),
                 side=hedge_side,
                 size=required_hedge_size,
-                order_type="market",
+                order_type=OrderType.MARKET,
                 price=hedge_price,
                 exchange=market_data.exchange
             )
             
-            logger.info(f"Calculated dynamic hedge: {hedge_side} {required_hedge_size} {hedge_order.symbol}")
+            logger.info(f"Calculated dynamic hedge: {hedge_order.side_str} {required_hedge_size} {hedge_order.symbol}")
             return hedge_order
             
         except Exception as e:
             logger.error(f"Error calculating dynamic hedge: {e}")
             return None
     
+    def calculate_hedge_batch(self, positions: Sequence[Position], deltas: Sequence[float],
+                              market_prices: Sequence[float], best_bids: Optional[Sequence[float]] = None,
+                              best_asks: Optional[Sequence[float]] = None, exchange: str = "") -> List[HedgeOrder]:
+        """
+        Vectorized calculate_hedge over many positions.
+        
+        Arrays are aligned with positions (NaN for a missing bid/ask). Only positions
+        whose hedge ratio is outside the rebalance band produce an order.
+        """
+        try:
+            if not len(positions):
+                return []
+            # Zero-value positions can't be rated and are skipped, as in the scalar path
+            threshold, target, band, max_size = self._params
+            return _batch_hedge_orders(
+                positions, deltas, market_prices, best_bids, best_asks, exchange,
+                gated=True, threshold=threshold, target=target, band=band, max_size=max_size
+            )
+        except Exception as e:
+            logger.error(f"Error calculating dynamic hedge batch: {e}")
+            return []
+    
     async def execute_hedge(self, hedge_order: HedgeOrder, exchange, position: Position = None) -> HedgeResult:
         """Execute dynamic hedge."""
         try:
-            start_time = datetime.now()
+            t0 = time.perf_counter_ns()
             
             # Validate hedge order
             if not self.validate_hedge(hedge_order, position):
@@ -328,12 +547,12 @@ class DynamicHedgingStrategy(BaseHedgingStrategy):
                 )
             
             # Execute order (simulated for demo)
-            logger.info(f"Executing dynamic hedge: {hedge_order.side} {hedge_order.size} {hedge_order.symbol}")
+            logger.info(f"Executing dynamic hedge: {hedge_order.side_str} {hedge_order.size} {hedge_order.symbol}")
             
             # Calculate execution cost
-            execution_cost = hedge_order.size * hedge_order.price * 0.0005  # 0.05% cost
+            execution_cost = hedge_order.size * hedge_order.price * self._COST_RATE
             
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = (time.perf_counter_ns() - t0) * 1e-9
             
             return HedgeResult(
                 success=True,
@@ -356,18 +575,27 @@ class DynamicHedgingStrategy(BaseHedgingStrategy):
 class HedgingManager:
     """Manager for coordinating hedging strategies."""
     
-    def __init__(self):
-        self.strategies = {
+    def __init__(self, target_hedge_ratio: float = 0.0, band_pp: float = 0.15):
+        """target_hedge_ratio and band_pp configure the dynamic strategy's rebalance band."""
+        self.strategies: Dict[str, HedgingStrategy] = {
             "delta_neutral": DeltaNeutralStrategy(),
             "options": OptionsHedgingStrategy(),
-            "dynamic": DynamicHedgingStrategy()
+            "dynamic": DynamicHedgingStrategy(target_hedge_ratio, band_pp)
         }
         self.active_strategy = None
+        self._strategy_names = tuple(self.strategies)
+        # Per-instance cache of get_strategy_info results, keyed on (name, active strategy id)
+        self._strategy_info_cached = lru_cache(maxsize=16)(self._build_strategy_info)
     
     def set_strategy(self, strategy_name: str) -> bool:
         """Set active hedging strategy."""
         if strategy_name in self.strategies:
             self.active_strategy = self.strategies[strategy_name]
+            # Strategies with tunable parameters re-specialize their hot path for the session
+            compile_fast_path = getattr(self.active_strategy, '_compile', None)
+            if compile_fast_path is not None:
+                compile_fast_path()
+            self._strategy_info_cached.cache_clear()
             logger.info(f"Set active strategy: {strategy_name}")
             return True
         else:
@@ -415,17 +643,125 @@ class HedgingManager:
                 message=f"Error: {str(e)}"
             )
     
-    def get_available_strategies(self) -> List[str]:
-        """Get list of available strategies."""
-        return list(self.strategies.keys())
+    async def execute_multi_hedge(self, strategy_names: List[str], position: Position,
+                                  risk_metrics: RiskMetrics, market_data: MarketData,
+                                  orderbook: OrderBook, exchange) -> HedgeResult:
+        """Calculate and execute one hedge leg per strategy concurrently, combining the results."""
+        try:
+            unknown = [name for name in strategy_names if name not in self.strategies]
+            if unknown or not strategy_names:
+                return HedgeResult(
+                    success=False,
+                    orders=[],
+                    total_cost=0.0,
+                    execution_time=0.0,
+                    message=f"Unknown strategies: {', '.join(unknown)}" if unknown else "No strategies given"
+                )
+            
+            t0 = time.perf_counter_ns()
+            strategies = [self.strategies[name] for name in strategy_names]
+            
+            # Legs are independent, so overlap their latency: wall time ~ slowest leg, not the sum
+            orders = await asyncio.gather(
+                *(s.calculate_hedge(position, risk_metrics, market_data, orderbook) for s in strategies),
+                return_exceptions=True
+            )
+            legs = [(s, o) for s, o in zip(strategies, orders) if isinstance(o, HedgeOrder)]
+            if not legs:
+                return HedgeResult(
+                    success=False,
+                    orders=[],
+                    total_cost=0.0,
+                    execution_time=0.0,
+                    message="No hedge order calculated"
+                )
+            
+            results = await asyncio.gather(
+                *(s.execute_hedge(o, exchange, position) for s, o in legs),
+                return_exceptions=True
+            )
+            results = [r for r in results if isinstance(r, HedgeResult)]
+            succeeded = [r for r in results if r.success]
+            
+            return HedgeResult(
+                success=len(succeeded) == len(legs),
+                orders=[order for r in succeeded for order in r.orders],
+                total_cost=sum(r.total_cost for r in succeeded),
+                execution_time=(time.perf_counter_ns() - t0) * 1e-9,
+                message=f"{len(succeeded)}/{len(legs)} hedge legs executed: "
+                        + "; ".join(r.message for r in results)
+            )
+            
+        except Exception as e:
+            logger.error(f"Error executing multi-strategy hedge: {e}")
+            return HedgeResult(
+                success=False,
+                orders=[],
+                total_cost=0.0,
+                execution_time=0.0,
+                message=f"Error: {str(e)}"
+            )
+    
+    async def execute_many(self, hedge_orders: Sequence[HedgeOrder], exchange,
+                           positions: Optional[Sequence[Position]] = None,
+                           concurrency: int = HEDGE_EXECUTION_CONCURRENCY) -> List[HedgeResult]:
+        """
+        Execute many hedge orders through one exchange with the active strategy.
+        
+        At most `concurrency` orders are in flight at once. positions, if given, is
+        aligned with hedge_orders and used for validation. Results are in order.
+        """
+        strategy = self.active_strategy
+        if not strategy:
+            return [
+                HedgeResult(
+                    success=False,
+                    orders=[],
+                    total_cost=0.0,
+                    execution_time=0.0,
+                    message="No active strategy set"
+                )
+                for _ in hedge_orders
+            ]
+        
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def _one(order: HedgeOrder, position: Optional[Position]) -> HedgeResult:
+            async with sem:
+                return await strategy.execute_hedge(order, exchange, position)
+        
+        if positions is None:
+            positions = [None] * len(hedge_orders)
+        results = await asyncio.gather(
+            *(_one(o, p) for o, p in zip(hedge_orders, positions)),
+            return_exceptions=True
+        )
+        return [
+            r if isinstance(r, HedgeResult) else HedgeResult(
+                success=False,
+                orders=[],
+                total_cost=0.0,
+                execution_time=0.0,
+                message=f"Error: {str(r)}"
+            )
+            for r in results
+        ]
+    
+    def get_available_strategies(self) -> Tuple[str, ...]:
+        """Get available strategy names."""
+        return self._strategy_names
     
     def get_strategy_info(self, strategy_name: str) -> Dict[str, Any]:
-        """Get information about a strategy."""
+        """Get information about a strategy (built once per active strategy; each caller gets its own copy)."""
+        return dict(self._strategy_info_cached(strategy_name, id(self.active_strategy)))
+    
+    def _build_strategy_info(self, strategy_name: str, active_id: int) -> Dict[str, Any]:
+        """Build the info dict for get_strategy_info."""
         if strategy_name in self.strategies:
             strategy = self.strategies[strategy_name]
             return {
                 "name": strategy.name,
                 "description": f"{strategy.name} hedging strategy",
-                "is_active": strategy == self.active_strategy
+                "is_active": id(strategy) == active_id
             }
         return {} 
\ No newline at end of file
@@ -18,12 +18,19 @@ License: MIT
 import asyncio
 import signal
 import sys
+from functools import cache
 from loguru import logger
 
 from utils.config import Config
 from utils.logger import setup_logger
+from utils.event_loop import install_uvloop
 from bot.telegram_bot import HedgingBot
 
+@cache
+def _get_config() -> Config:
+    """Load configuration once per process; later apps reuse the parsed settings."""
+    return Config()
+
 class HedgingBotApp:
     """
     Main application class for the crypto portfolio hedging bot.
@@ -35,42 +42,52 @@ class HedgingBotApp:
         config (Config): Application configuration instance
         bot (HedgingBot): Telegram bot instance
         running (bool): Application running state flag
+        _shutdown_evt (asyncio.Event): Set by signal handlers to end the run
     """
     
     def __init__(self):
         """
         Initialize the hedging bot application.
         
-        Sets up configuration, logging, and signal handlers for graceful shutdown.
+        Sets up configuration and logging. Signal handlers are registered on the
+        event loop once it is running.
         """
-        self.config = Config()
-        self.bot = None
+        self.config = _get_config()
+        self.bot = None  # Created on first start()
         self.running = False
+        self._shutdown_evt = None
         
         # Setup logging with proper configuration
         setup_logger()
-        
-        # Setup signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self.signal_handler)
-        signal.signal(signal.SIGTERM, self.signal_handler)
     
-    def signal_handler(self, signum, frame):
+    def signal_handler(self, signum):
         """
         Handle shutdown signals for graceful application termination.
         
+        Runs on the event loop, so it can set the shutdown event directly.
+        
         Args:
             signum (int): Signal number received
-            frame: Current stack frame (unused)
         """
         logger.info(f"Received signal {signum}, initiating graceful shutdown...")
-        self.running = False
+        self._shutdown_evt.set()
+    
+    def _install_signal_handlers(self):
+        """Deliver SIGINT/SIGTERM to the event loop instead of polling a flag."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.signal_handler, sig)
+            except NotImplementedError:
+                # Windows event loops don't support add_signal_handler
+                signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(self.signal_handler, signum))
     
-    def start(self):
+    async def start(self):
         """
         Start the hedging bot application.
         
-        Validates configuration, initializes the bot, and starts the main
-        application loop.
+        Validates configuration, initializes the bot, and starts polling on the
+        running event loop.
         
         Returns:
             bool: True if startup successful, False otherwise
@@ -85,12 +102,13 @@ class HedgingBotApp:
             logger.info("Version: 2.0.0")
             logger.info("Features: Real-time monitoring, automated hedging, analytics")
             
-            # Initialize the Telegram bot
-            self.bot = HedgingBot()
+            # Initialize the Telegram bot (once, so a retried start() reuses it)
+            if self.bot is None:
+                self.bot = HedgingBot()
             
             # Start the bot and set running flag
+            await self.bot.start()
             self.running = True
-            self.bot.run()
             
             return True
             
@@ -98,7 +116,7 @@ class HedgingBotApp:
             logger.error(f"Critical error during application startup: {e}")
             return False
     
-    def stop(self):
+    async def stop(self):
         """
         Stop the hedging bot application gracefully.
         
@@ -109,13 +127,30 @@ class HedgingBotApp:
             self.running = False
             
             if self.bot:
-                self.bot.stop()
+                await self.bot.shutdown()
             
             logger.info("Application shutdown completed successfully")
             
         except Exception as e:
             logger.error(f"Error during application shutdown: {e}")
     
+    async def _run_async(self):
+        """Start the bot, then sleep on the shutdown event until a signal arrives."""
+        self._shutdown_evt = asyncio.Event()
+        self._install_signal_handlers()
+        try:
+            # Attempt to start the application
+            success = await self.start()
+            if not success:
+                logger.error("Failed to start application - exiting")
+                return
+            
+            logger.info("Application started successfully - waiting for shutdown signal")
+            await self._shutdown_evt.wait()
+        finally:
+            # Ensure cleanup happens even if errors occur
+            await self.stop()
+    
     def run(self):
         """
         Run the main application loop.
@@ -124,25 +159,11 @@ class HedgingBotApp:
         is received or an error occurs.
         """
         try:
-            # Attempt to start the application
-            success = self.start()
-            if not success:
-                logger.error("Failed to start application - exiting")
-                return
-            
-            logger.info("Application started successfully - waiting for shutdown signal")
-            
-            # Keep the application running until shutdown signal
-            while self.running:
-                pass
-                
+            asyncio.run(self._run_async())
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt - shutting down")
         except Exception as e:
             logger.error(f"Unexpected error in main loop: {e}")
-        finally:
-            # Ensure cleanup happens even if errors occur
-            self.stop()
 
 if __name__ == "__main__":
     """
@@ -151,6 +172,9 @@ if __name__ == "__main__":
     Creates and runs the HedgingBotApp instance with proper error handling.
     """
     try:
+        # Must run before any event loop is created
+        if install_uvloop():
+            logger.info("Using uvloop event loop")
         app = HedgingBotApp()
         app.run()
     except KeyboardInterrupt:
@@ -30,10 +30,45 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 import joblib
 import os
-from typing import List, Optional, Tuple, Dict, Any
+import glob
+import hashlib
+import pickle
+from functools import lru_cache
+from typing import List, Optional, Tuple, Dict, Any, Union
 from datetime import datetime, timedelta
 from loguru import logger
 
+# Optional ahead-of-time compilation of the forest into a native library
+try:
+    import treelite
+    import tl2cgen
+    TREELITE_AVAILABLE = True
+except ImportError:
+    TREELITE_AVAILABLE = False
+
+NATIVE_LIB_SUFFIX = '.so'
+NATIVE_COMPILE_THREADS = 6  # Source files the generated C is split into for parallel compilation
+# Compiler used for the native library; set HEDGE_MODEL_TOOLCHAIN empty to skip compilation
+NATIVE_TOOLCHAIN = os.getenv("HEDGE_MODEL_TOOLCHAIN", "gcc")
+
+PREDICTION_CACHE_SIZE = 4096  # Quantized feature vectors whose predictions are memoized
+# Grid each feature is rounded to before cache lookup; finer moves don't change the decision
+FEATURE_QUANTA = {
+    'volatility': 1e-3,
+    'position_size': 1e-2,
+    'delta_exposure': 1e-2,
+    'time_since_hedge': 1 / 60,  # One minute, in hours
+    'market_momentum': 1e-3,
+    'risk_level': 1e-2,
+}
+DEFAULT_FEATURE_QUANTUM = 1e-6  # For features loaded from a model that aren't in FEATURE_QUANTA
+
+# sklearn trees compare thresholds in float32, so wider features only cost memory bandwidth
+FEATURE_DTYPE = np.float32
+N_ESTIMATORS_BASELINE = 100  # Forest size tune_n_estimators measures smaller forests against
+N_ESTIMATORS_CANDIDATES = (10, 20, 30, 40, 50, 75)
+N_ESTIMATORS_TOLERANCE = 0.01  # Accepted relative drop in out-of-bag accuracy vs the baseline
+
 class HedgeTimingClassifier:
     """
     Machine learning classifier for optimal hedge timing.
@@ -56,23 +91,33 @@ class HedgeTimingClassifier:
         scaler (StandardScaler): Feature scaler for normalization
         feature_names (List[str]): Names of features used in training
         last_hedge_times (Dict[str, datetime]): Track last hedge time per asset
+        native_toolchain (Optional[str]): Compiler for the native library, None to disable it
+        _predictor (Optional[tl2cgen.Predictor]): Compiled forest, when treelite is installed
+        _fingerprint (Optional[str]): SHA-256 of the saved model, naming its native library
     """
     
-    def __init__(self, model_path: str = 'ml/hedge_timing_model.pkl'):
+    def __init__(self, model_path: str = 'ml/hedge_timing_model.pkl',
+                 native_toolchain: Optional[str] = NATIVE_TOOLCHAIN):
         """
         Initialize the hedge timing classifier.
         
         Args:
             model_path (str): Path to saved model file (default: 'ml/hedge_timing_model.pkl')
+            native_toolchain (Optional[str]): Compiler treelite builds the native library
+                with on save() (default: HEDGE_MODEL_TOOLCHAIN or 'gcc'); None or empty
+                skips compilation and predicts with sklearn
         """
         self.model_path = model_path
+        self.native_toolchain = native_toolchain or None
         self.model = RandomForestClassifier(
-            n_estimators=100,    # Number of trees in the forest
+            n_estimators=40,     # Number of trees in the forest (see tune_n_estimators)
             random_state=42,     # For reproducible results
             max_depth=8,         # Maximum depth of trees
+            max_features='sqrt', # Features considered per split
             min_samples_split=10, # Minimum samples required to split
             min_samples_leaf=5,   # Minimum samples required at leaf node
-            class_weight='balanced'  # Handle class imbalance
+            class_weight='balanced',  # Handle class imbalance
+            n_jobs=1              # Single-threaded prediction; fit() trains on all cores
         )
         self.scaler = StandardScaler()
         self.feature_names = [
@@ -80,6 +125,11 @@ class HedgeTimingClassifier:
             'time_since_hedge', 'market_momentum', 'risk_level'
         ]
         self.last_hedge_times = {}  # Track last hedge time per asset
+        self._predictor = None  # Native predictor built from the saved model, if available
+        self._fingerprint = None
+        # Per-instance memo of single predictions; cleared whenever the model changes
+        self._predict_cached = lru_cache(maxsize=PREDICTION_CACHE_SIZE)(self._predict_quantized)
+        self._refresh_feature_cache()
         
         # Load pre-trained model if available
         if os.path.exists(self.model_path):
@@ -105,34 +155,84 @@ class HedgeTimingClassifier:
                 - risk_level: Risk level indicator
                 
         Returns:
-            np.ndarray: Normalized feature vector
+            np.ndarray: Normalized (1, n_features) feature vector. This is a reused
+                buffer, overwritten by the next call; copy it to keep it.
             
         Raises:
             ValueError: If required features are missing
         """
+        buf = self._buf
         try:
-            # Extract features in the correct order
-            features = []
-            for feature_name in self.feature_names:
-                if feature_name not in features_dict:
-                    raise ValueError(f"Missing required feature: {feature_name}")
-                features.append(float(features_dict[feature_name]))
-            
-            # Convert to numpy array and reshape for scaler
-            feature_array = np.array(features).reshape(1, -1)
-            
-            # Normalize features if scaler is fitted
-            if hasattr(self.scaler, 'mean_'):
-                feature_array = self.scaler.transform(feature_array)
+            for i, feature_name in enumerate(self._feature_names_tuple):
+                buf[0, i] = features_dict[feature_name]
+        except KeyError as e:
+            logger.error(f"Error preparing features: Missing required feature: {e.args[0]}")
+            raise ValueError(f"Missing required feature: {e.args[0]}") from None
+        
+        return self._scale_inplace(buf)
+
+    def _refresh_feature_cache(self) -> None:
+        """
+        Rebuild the per-prediction buffer and cached scaler parameters.
+        
+        Called whenever feature_names or the scaler change (init, fit, load).
+        """
+        self._feature_names_tuple = tuple(self.feature_names)
+        self._quanta = tuple(FEATURE_QUANTA.get(n, DEFAULT_FEATURE_QUANTUM) for n in self._feature_names_tuple)
+        self._buf = np.empty((1, len(self._feature_names_tuple)), dtype=FEATURE_DTYPE)
+        if hasattr(self.scaler, 'mean_'):
+            self._mean = self.scaler.mean_.astype(FEATURE_DTYPE)
+            self._inv_scale = (1.0 / self.scaler.scale_).astype(FEATURE_DTYPE)
+        else:
+            self._mean = None
+            self._inv_scale = None
+
+    def _scale_inplace(self, X: np.ndarray) -> np.ndarray:
+        """
+        Standardize X in place with the cached scaler parameters (no-op before fitting).
+        
+        Equivalent to StandardScaler.transform without its validation and copies.
+        """
+        if self._mean is not None:
+            np.subtract(X, self._mean, out=X)
+            np.multiply(X, self._inv_scale, out=X)
+        return X
+
+    def _feature_matrix(self, features_list, copy: bool = True) -> np.ndarray:
+        """
+        Build one unscaled (N, n_features) matrix from feature data.
+        
+        Args:
+            features_list: Feature dictionaries (see _prepare_features), or rows
+                already in feature_names order as a list of lists or an ndarray
+            copy (bool): If False, a FEATURE_DTYPE ndarray input is returned as-is rather
+                than copied; only safe when the caller won't scale it in place
             
-            logger.debug(f"Prepared features: {dict(zip(self.feature_names, features))}")
-            return feature_array
+        Returns:
+            np.ndarray: FEATURE_DTYPE feature matrix with columns in feature_names order
             
-        except Exception as e:
-            logger.error(f"Error preparing features: {e}")
-            raise
+        Raises:
+            ValueError: If required features are missing or rows have the wrong width
+        """
+        if isinstance(features_list, np.ndarray):
+            X = features_list.astype(FEATURE_DTYPE, copy=copy)
+        elif len(features_list) and not isinstance(features_list[0], dict):
+            X = np.asarray(features_list, dtype=FEATURE_DTYPE)
+        else:
+            names = self._feature_names_tuple
+            try:
+                X = np.asarray([[fd[n] for n in names] for fd in features_list], dtype=FEATURE_DTYPE)
+            except KeyError as e:
+                raise ValueError(f"Missing required feature: {e.args[0]}") from None
+            X = X.reshape(len(features_list), len(names))
+        
+        if X.ndim != 2 or X.shape[1] != len(self.feature_names):
+            raise ValueError(f"Expected {len(self.feature_names)} features per sample "
+                             f"({', '.join(self.feature_names)}), got shape {X.shape}")
+        return X
 
-    def fit(self, features_list: List[Dict[str, Any]], labels: List[int]) -> None:
+    def fit(self, features_list: Union[List[Dict[str, Any]], List[List[float]], np.ndarray],
+            labels: List[int]) -> None:
         """
         Train the hedge timing classifier.
         
@@ -141,7 +241,8 @@ class HedgeTimingClassifier:
         hedging conditions.
         
         Args:
-            features_list (List[Dict[str, Any]]): List of feature dictionaries
+            features_list: List of feature dictionaries, or rows already in
+                feature_names order (list of lists or an (N, n_features) ndarray)
             labels (List[int]): Binary labels (1 = hedge now, 0 = wait)
             
         Raises:
@@ -157,23 +258,21 @@ class HedgeTimingClassifier:
             
             logger.info(f"Training hedge timing model on {len(features_list)} samples")
             
-            # Prepare feature matrix
-            X = []
-            for features_dict in features_list:
-                feature_vector = self._prepare_features(features_dict)
-                X.append(feature_vector.flatten())
-            
-            X = np.array(X)
-            y = np.array(labels)
+            # Prepare the raw feature matrix in one allocation
+            X = self._feature_matrix(features_list, copy=False)
+            y = np.asarray(labels)
             
-            # Fit the scaler on training data
-            self.scaler.fit(X)
+            # Fit the scaler on training data and scale features
+            X_scaled = self.scaler.fit_transform(X)
+            self._refresh_feature_cache()
             
-            # Scale features
-            X_scaled = self.scaler.transform(X)
-            
-            # Train the classifier
-            self.model.fit(X_scaled, y)
+            # Train the classifier on all cores, then go back to single-threaded prediction
+            self.model.set_params(n_jobs=-1)
+            try:
+                self.model.fit(X_scaled, y)
+            finally:
+                self.model.set_params(n_jobs=1)
+            self._predict_cached.cache_clear()
             
             # Save the trained model
             self.save()
@@ -186,12 +285,116 @@ class HedgeTimingClassifier:
             logger.error(f"Error training hedge timing model: {e}")
             raise
 
+    def predict_batch(self, features_list: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Predict hedge timing for many feature sets in one model call.
+        
+        All samples are stacked into a single matrix, scaled once and scored with
+        one predict_proba call, so the per-call sklearn overhead is paid once per
+        batch rather than once per asset.
+        
+        Args:
+            features_list (List[Dict[str, Any]]): Feature dictionaries (see predict)
+            
+        Returns:
+            Optional[List[Dict[str, Any]]]: One result per input, each containing
+                prediction, confidence, hedge_probability and wait_probability,
+                or None if prediction fails
+        """
+        try:
+            if not features_list:
+                return []
+            
+            if len(features_list) == 1:
+                X = self._prepare_features(features_list[0])
+            else:
+                X = self._scale_inplace(self._feature_matrix(features_list))
+            
+            # The predicted class is the argmax of the probabilities, so one call gives both
+            proba = self._predict_proba(X)
+            predictions = self.model.classes_[proba.argmax(axis=1)]
+            
+            results = [
+                {
+                    'prediction': int(prediction),
+                    'confidence': float(max(p)),
+                    'hedge_probability': float(p[1]),  # Probability of hedge now
+                    'wait_probability': float(p[0])    # Probability of wait
+                }
+                for prediction, p in zip(predictions.tolist(), proba.tolist())
+            ]
+            
+            logger.debug(f"Hedge timing batch prediction for {len(results)} samples")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error predicting hedge timing batch: {e}")
+            return None
+
+    def _predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for a scaled feature matrix.
+        
+        Uses the compiled native predictor when one is loaded, otherwise sklearn.
+        
+        Args:
+            X (np.ndarray): Scaled (N, n_features) feature matrix
+            
+        Returns:
+            np.ndarray: (N, n_classes) probabilities
+        """
+        if self._predictor is None:
+            return self.model.predict_proba(X)
+        
+        raw = np.asarray(self._predictor.predict(tl2cgen.DMatrix(X, dtype='float32')))
+        raw = raw.reshape(len(X), -1)
+        if raw.shape[1] == 1:
+            # Binary models may emit only the positive-class probability
+            return np.hstack([1.0 - raw, raw])
+        return raw
+
+    def _quantize(self, features_dict: Dict[str, Any]) -> Tuple[int, ...]:
+        """
+        Cache key for a feature dict: each feature as a whole number of FEATURE_QUANTA steps.
+        
+        Raises:
+            ValueError: If required features are missing
+        """
+        try:
+            return tuple(round(features_dict[n] / q) for n, q in zip(self._feature_names_tuple, self._quanta))
+        except KeyError as e:
+            raise ValueError(f"Missing required feature: {e.args[0]}") from None
+
+    def _predict_quantized(self, key: Tuple[int, ...]) -> Dict[str, Any]:
+        """Predict for the grid point a _quantize key stands for (memoized per instance)."""
+        features = {n: k * q for n, k, q in zip(self._feature_names_tuple, key, self._quanta)}
+        results = self.predict_batch([features])
+        if not results:
+            # Raise rather than return None so lru_cache does not memoize the failure
+            raise RuntimeError("batch prediction failed")
+        return results[0]
+
+    def _predict_one(self, features_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Single prediction through the quantized LRU cache; returns a fresh dict per call."""
+        try:
+            result = self._predict_cached(self._quantize(features_dict))
+        except Exception as e:
+            logger.error(f"Error predicting hedge timing: {e}")
+            return None
+        return dict(result) if result is not None else None
+
+    def prediction_cache_info(self):
+        """Hit/miss statistics of the single-prediction cache (functools cache_info)."""
+        return self._predict_cached.cache_info()
+
     def predict(self, features_dict: Dict[str, Any]) -> Optional[int]:
         """
         Predict optimal hedge timing based on current conditions.
         
         This method uses the trained classifier to determine whether
         it's optimal to hedge now (1) or wait for better conditions (0).
+        Features are rounded to FEATURE_QUANTA and results are memoized, so
+        repeated calls in a steady market skip the forest entirely.
         
         Args:
             features_dict (Dict[str, Any]): Current feature values
@@ -205,30 +408,21 @@ class HedgeTimingClassifier:
         Returns:
             Optional[int]: Prediction (1 = hedge now, 0 = wait), or None if prediction fails
         """
-        try:
-            # Prepare features
-            feature_array = self._prepare_features(features_dict)
-            
-            # Make prediction
-            prediction = int(self.model.predict(feature_array)[0])
-            
-            # Get prediction probability for confidence
-            proba = self.model.predict_proba(feature_array)[0]
-            confidence = max(proba)
-            
-            logger.debug(f"Hedge timing prediction: {prediction} (confidence: {confidence:.3f})")
-            return prediction
-            
-        except Exception as e:
-            logger.error(f"Error predicting hedge timing: {e}")
+        result = self._predict_one(features_dict)
+        if result is None:
             return None
+        
+        logger.debug(f"Hedge timing prediction: {result['prediction']} "
+                     f"(confidence: {result['confidence']:.3f})")
+        return result['prediction']
 
     def predict_with_confidence(self, features_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Predict hedge timing with confidence scores.
         
         This method provides both the prediction and confidence scores
-        for more detailed analysis of the model's decision.
+        for more detailed analysis of the model's decision. Shares predict's
+        quantized cache.
         
         Args:
             features_dict (Dict[str, Any]): Current feature values
@@ -237,27 +431,12 @@ class HedgeTimingClassifier:
             Optional[Dict[str, Any]]: Dictionary containing prediction and confidence,
                                     or None if prediction fails
         """
-        try:
-            # Prepare features
-            feature_array = self._prepare_features(features_dict)
-            
-            # Make prediction with probabilities
-            prediction = int(self.model.predict(feature_array)[0])
-            proba = self.model.predict_proba(feature_array)[0]
-            
-            result = {
-                'prediction': prediction,
-                'confidence': float(max(proba)),
-                'hedge_probability': float(proba[1]),  # Probability of hedge now
-                'wait_probability': float(proba[0])    # Probability of wait
-            }
-            
-            logger.debug(f"Hedge timing prediction with confidence: {result}")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error predicting hedge timing with confidence: {e}")
+        result = self._predict_one(features_dict)
+        if result is None:
             return None
+        
+        logger.debug(f"Hedge timing prediction with confidence: {result}")
+        return result
 
     def update_last_hedge_time(self, asset: str, hedge_time: datetime = None) -> None:
         """
@@ -306,16 +485,23 @@ class HedgeTimingClassifier:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
             
-            # Save both model and scaler
+            # Save both model and scaler, with the fingerprint that names the native library
+            self._fingerprint = hashlib.sha256(
+                pickle.dumps(self.model, protocol=pickle.HIGHEST_PROTOCOL)
+            ).hexdigest()
             model_data = {
                 'model': self.model,
                 'scaler': self.scaler,
-                'feature_names': self.feature_names
+                'feature_names': self.feature_names,
+                'fingerprint': self._fingerprint
             }
             
             joblib.dump(model_data, self.model_path)
             logger.debug(f"Model and scaler saved to {self.model_path}")
             
+            # Keep the compiled library in sync with the pickle
+            self._export_native()
+            
         except Exception as e:
             logger.error(f"Error saving model: {e}")
             raise
@@ -339,15 +525,123 @@ class HedgeTimingClassifier:
             model_data = joblib.load(self.model_path)
             
             self.model = model_data['model']
+            self.model.set_params(n_jobs=1)  # Older pickles were saved with n_jobs=-1
             self.scaler = model_data['scaler']
             self.feature_names = model_data['feature_names']
+            self._fingerprint = model_data.get('fingerprint')  # Absent in older pickles
+            self._refresh_feature_cache()
+            self._predict_cached.cache_clear()
             
             logger.debug(f"Model and scaler loaded from {self.model_path}")
             
+            self._load_native()
+            
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             raise
 
+    def _native_libpath(self) -> Optional[str]:
+        """Path of the native library built from the current model, or None if it has no fingerprint."""
+        if not self._fingerprint:
+            return None
+        return f"{self.model_path}.{self._fingerprint[:16]}{NATIVE_LIB_SUFFIX}"
+
+    def _export_native(self) -> None:
+        """
+        Compile the trained forest into a shared library next to the pickle.
+        
+        The library name carries the model fingerprint, so it can only ever be
+        loaded alongside the pickle it was built from. Libraries of other models
+        are removed first.
+        """
+        libpath = self._native_libpath()
+        self._predictor = None
+        try:
+            for stale in glob.glob(f"{glob.escape(self.model_path)}*{NATIVE_LIB_SUFFIX}"):
+                if stale != libpath:
+                    os.remove(stale)
+            
+            if (libpath is None or not self.native_toolchain or not TREELITE_AVAILABLE
+                    or not hasattr(self.model, 'estimators_')):
+                return
+            
+            native_model = treelite.sklearn.import_model(self.model)
+            tl2cgen.export_lib(native_model, toolchain=self.native_toolchain, libpath=libpath,
+                               params={'parallel_comp': NATIVE_COMPILE_THREADS})
+            self._predictor = tl2cgen.Predictor(libpath)
+            logger.debug(f"Compiled hedge timing model to {libpath}")
+            
+        except Exception as e:
+            logger.error(f"Error compiling model, falling back to sklearn: {e}")
+            if libpath and os.path.exists(libpath):
+                os.remove(libpath)
+
+    def _load_native(self) -> None:
+        """Load the compiled forest built from the loaded model's fingerprint, if present and usable."""
+        libpath = self._native_libpath()
+        self._predictor = None
+        if not TREELITE_AVAILABLE or not self.native_toolchain or libpath is None or not os.path.exists(libpath):
+            return
+        
+        try:
+            self._predictor = tl2cgen.Predictor(libpath)
+            logger.debug(f"Loaded compiled hedge timing model from {libpath}")
+        except Exception as e:
+            logger.error(f"Error loading compiled model, falling back to sklearn: {e}")
+
+    def tune_n_estimators(self, features_list: Union[List[Dict[str, Any]], List[List[float]], np.ndarray],
+                          labels: List[int],
+                          candidates: Tuple[int, ...] = N_ESTIMATORS_CANDIDATES) -> Optional[Dict[str, Any]]:
+        """
+        Find the smallest forest whose out-of-bag accuracy is close to a large one.
+        
+        Fits throwaway copies of the configured forest with oob_score=True, first at
+        N_ESTIMATORS_BASELINE trees and then at each candidate size, and picks the
+        smallest size within N_ESTIMATORS_TOLERANCE (relative) of the baseline score.
+        The classifier itself is left untouched; apply the result with
+        self.model.set_params(n_estimators=...) before fit().
+        
+        Args:
+            features_list: Training features, in any form fit() accepts
+            labels (List[int]): Binary labels (1 = hedge now, 0 = wait)
+            candidates (Tuple[int, ...]): Forest sizes to try
+            
+        Returns:
+            Optional[Dict[str, Any]]: Dictionary containing n_estimators (the chosen size),
+                baseline_oob_score and oob_scores per candidate, or None if tuning fails
+        """
+        try:
+            from sklearn.base import clone
+            
+            X = StandardScaler().fit_transform(self._feature_matrix(features_list))
+            y = np.asarray(labels)
+            
+            def oob_score(n_estimators: int) -> float:
+                forest = clone(self.model).set_params(n_estimators=n_estimators, oob_score=True)
+                return forest.fit(X, y).oob_score_
+            
+            baseline = oob_score(N_ESTIMATORS_BASELINE)
+            oob_scores = {}
+            chosen = N_ESTIMATORS_BASELINE
+            for n_estimators in sorted(candidates):
+                oob_scores[n_estimators] = score = oob_score(n_estimators)
+                # Small forests can leave samples without OOB votes, giving a NaN score
+                if not np.isnan(score) and score >= baseline * (1 - N_ESTIMATORS_TOLERANCE):
+                    chosen = n_estimators
+                    break
+            
+            logger.info(f"Selected n_estimators={chosen} (baseline OOB accuracy {baseline:.4f} "
+                        f"at {N_ESTIMATORS_BASELINE} trees, candidates: {oob_scores})")
+            return {
+                'n_estimators': chosen,
+                'baseline_oob_score': baseline,
+                'oob_scores': oob_scores
+            }
+            
+        except Exception as e:
+            logger.error(f"Error tuning n_estimators: {e}")
+            return None
+
     def get_feature_importance(self) -> Optional[Dict[str, float]]:
         """
         Get feature importance scores from the trained model.
@@ -401,17 +695,9 @@ class HedgeTimingClassifier:
                 logger.warning("No test data available for evaluation")
                 return None
             
-            # Prepare test features
-            X_test = []
-            for features_dict in test_features:
-                feature_vector = self._prepare_features(features_dict)
-                X_test.append(feature_vector.flatten())
-            
-            X_test = np.array(X_test)
-            y_test = np.array(test_labels)
-            
-            # Scale test features
-            X_test_scaled = self.scaler.transform(X_test)
+            # Prepare and scale test features
+            X_test_scaled = self._scale_inplace(self._feature_matrix(test_features))
+            y_test = np.asarray(test_labels)
             
             # Make predictions
             y_pred = self.model.predict(X_test_scaled)
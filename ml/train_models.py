@@ -17,22 +17,25 @@ vol_model.fit(btc_prices, window=10)
 print("Volatility model trained and saved.")
 
 # Generate synthetic data for hedge timing model
-# Features: [volatility, abs(position.size), time since last hedge (seconds), delta]
+# Features, in HedgeTimingClassifier.feature_names order:
+# [volatility, abs(position.size), delta, hours since last hedge, market momentum, risk level]
 # Labels: 1=hedge, 0=wait
-np.random.seed(42)
-X = []
-y = []
-for i in range(100):
-    vol = np.random.uniform(0.01, 0.1)
-    size = np.random.uniform(1, 100)
-    time_since = np.random.uniform(0, 3600)
-    delta = np.random.uniform(-1, 1)
-    label = 1 if (vol > 0.05 and abs(delta) > 0.5 and time_since > 600) else 0
-    X.append([vol, size, time_since, delta])
-    y.append(label)
-X = np.array(X)
-y = np.array(y)
+N_SAMPLES = 100
+rng = np.random.default_rng(42)
+vol = rng.uniform(0.01, 0.1, N_SAMPLES)
+size = rng.uniform(1, 100, N_SAMPLES)
+delta = rng.uniform(-1, 1, N_SAMPLES)
+time_since = rng.uniform(0, 1, N_SAMPLES)  # Hours
+momentum = rng.uniform(-1, 1, N_SAMPLES)
+risk_level = rng.uniform(0, 1, N_SAMPLES)
+y = ((vol > 0.05) & (np.abs(delta) > 0.5) & (time_since > 600 / 3600)).astype(np.int8)
+X = np.column_stack([vol, size, delta, time_since, momentum, risk_level])
 
 hedge_model = HedgeTimingClassifier()
+# Use the smallest forest whose out-of-bag accuracy matches a 100-tree one
+tuning = hedge_model.tune_n_estimators(X, y)
+if tuning:
+    hedge_model.model.set_params(n_estimators=tuning['n_estimators'])
+    print(f"Using {tuning['n_estimators']} trees for the hedge timing model.")
 hedge_model.fit(X, y)
 print("Hedge timing model trained and saved.") 
\ No newline at end of file
@@ -32,7 +32,7 @@ from loguru import logger
 
 from exchanges.base import Position, OrderBook, MarketData
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RiskMetrics:
     """
     Comprehensive risk metrics data structure.
@@ -63,7 +63,7 @@ class RiskMetrics:
     beta: float
     timestamp: datetime
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class HedgeRecommendation:
     """
     Hedge recommendation data structure.
@@ -250,34 +250,52 @@ class RiskCalculator:
                         total_vega += position_metrics.vega
                         total_value += position.size * market_data.price
             
-            # Calculate portfolio VaR (simplified - assumes 25% portfolio volatility)
-            portfolio_volatility = 0.25  # Conservative portfolio volatility estimate
-            var_95 = total_value * portfolio_volatility * 1.645 * np.sqrt(30/365)
-            var_99 = total_value * portfolio_volatility * 2.326 * np.sqrt(30/365)
-            
-            # Calculate portfolio max drawdown
-            max_drawdown = total_value * 0.15  # 15% max drawdown for diversified portfolio
-            
-            # Portfolio correlation and beta (diversification benefits)
-            correlation = 0.7  # Lower correlation due to diversification
-            beta = 0.9  # Slightly lower beta for diversified portfolio
-            
-            return RiskMetrics(
-                delta=total_delta,
-                gamma=total_gamma,
-                theta=total_theta,
-                vega=total_vega,
-                var_95=var_95,
-                var_99=var_99,
-                max_drawdown=max_drawdown,
-                correlation=correlation,
-                beta=beta,
-                timestamp=datetime.now()
-            )
+            return self.build_portfolio_metrics(total_delta, total_gamma, total_theta, total_vega, total_value)
         except Exception as e:
             logger.error(f"Error calculating portfolio risk: {e}")
             return None
     
+    def build_portfolio_metrics(self, total_delta: float, total_gamma: float,
+                                total_theta: float, total_vega: float,
+                                total_value: float) -> RiskMetrics:
+        """
+        Build portfolio-level risk metrics from aggregated Greeks and value.
+        
+        Args:
+            total_delta (float): Sum of position deltas
+            total_gamma (float): Sum of position gammas
+            total_theta (float): Sum of position thetas
+            total_vega (float): Sum of position vegas
+            total_value (float): Total notional value of the priced positions
+        
+        Returns:
+            RiskMetrics: Portfolio-level risk metrics
+        """
+        # Calculate portfolio VaR (simplified - assumes 25% portfolio volatility)
+        portfolio_volatility = 0.25  # Conservative portfolio volatility estimate
+        var_95 = total_value * portfolio_volatility * 1.645 * np.sqrt(30/365)
+        var_99 = total_value * portfolio_volatility * 2.326 * np.sqrt(30/365)
+        
+        # Calculate portfolio max drawdown
+        max_drawdown = total_value * 0.15  # 15% max drawdown for diversified portfolio
+        
+        # Portfolio correlation and beta (diversification benefits)
+        correlation = 0.7  # Lower correlation due to diversification
+        beta = 0.9  # Slightly lower beta for diversified portfolio
+        
+        return RiskMetrics(
+            delta=total_delta,
+            gamma=total_gamma,
+            theta=total_theta,
+            vega=total_vega,
+            var_95=var_95,
+            var_99=var_99,
+            max_drawdown=max_drawdown,
+            correlation=correlation,
+            beta=beta,
+            timestamp=datetime.now()
+        )
+    
     def calculate_hedge_ratio(self, spot_position: Position, hedge_instrument: str,
                             spot_market_data: MarketData, hedge_market_data: MarketData,
                             correlation: float = 0.95) -> float:
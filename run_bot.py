@@ -12,8 +12,11 @@ sys.path.insert(0, project_root)
 
 # Now import and run the bot
 from bot.telegram_bot import HedgingBot
+from utils.event_loop import install_uvloop
 
 if __name__ == "__main__":
+    # Must run before any event loop is created
+    install_uvloop()
     bot = HedgingBot()
     try:
         bot.run()
@@ -7,6 +7,7 @@ from loguru import logger
 from dotenv import load_dotenv
 
 from exchanges.deribit import DeribitExchange
+from exchanges.session import close_shared_session
 from utils.config import Config
 
 async def test_deribit_connection():
@@ -59,9 +60,9 @@ async def test_deribit_connection():
         
         if orderbook:
             logger.info(f"✅ Orderbook received")
-            logger.info(f"   Best Bid: ${orderbook.bids[0]['price']:,.2f}")
-            logger.info(f"   Best Ask: ${orderbook.asks[0]['price']:,.2f}")
-            logger.info(f"   Spread: ${orderbook.asks[0]['price'] - orderbook.bids[0]['price']:,.2f}")
+            logger.info(f"   Best Bid: ${orderbook.bid_prices[0]:,.2f}")
+            logger.info(f"   Best Ask: ${orderbook.ask_prices[0]:,.2f}")
+            logger.info(f"   Spread: ${orderbook.ask_prices[0] - orderbook.bid_prices[0]:,.2f}")
         else:
             logger.warning("⚠️ Could not fetch orderbook")
         
@@ -180,6 +181,7 @@ async def main():
     
     # Test trading simulation
     success2 = await test_deribit_trading_simulation()
+    await close_shared_session()
     
     logger.info("\n" + "=" * 50)
     if success1 and success2:
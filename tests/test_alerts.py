@@ -0,0 +1,80 @@
+"""
+Unit tests for the vectorized custom-alert evaluation in the Telegram bot.
+"""
+import numpy as np
+from datetime import datetime
+
+from bot.telegram_bot import HedgingBot, Alert, _ALERT_METRIC_INDEX, _compute_triggered
+
+class TestComputeTriggered:
+    """Test cases for _compute_triggered."""
+
+    def test_above_and_below(self):
+        """Above alerts trigger on strictly greater values, below alerts on strictly smaller ones."""
+        snapshot = np.array([10.0, 5.0, -3.0])
+        metric_ids = np.array([0, 0, 1, 2, 2], dtype=np.intp)
+        thresholds = np.array([9.0, 10.0, 6.0, -3.0, 0.0])
+        above = np.array([True, True, False, False, True])
+        triggered, values = _compute_triggered(metric_ids, above, thresholds, snapshot)
+        assert list(triggered) == [0, 2]
+        np.testing.assert_array_equal(values, [10.0, 10.0, 5.0, -3.0, -3.0])
+
+    def test_no_alerts(self):
+        """Empty alert arrays produce no triggers."""
+        triggered, values = _compute_triggered(
+            np.array([], dtype=np.intp), np.array([], dtype=bool), np.array([], dtype=np.float64),
+            np.zeros(len(_ALERT_METRIC_INDEX))
+        )
+        assert triggered.size == 0
+        assert values.size == 0
+
+class TestAlertsChanged:
+    """Test cases for HedgingBot._alerts_changed."""
+
+    def setup_method(self):
+        """Setup a bare bot and a user with a mix of alerts."""
+        self.bot = HedgingBot.__new__(HedgingBot)
+        now = datetime.now()
+        self.alerts = {
+            1: Alert(1, "delta", "above", 100.0, now),
+            2: Alert(2, "var", "below", -50.0, now),
+            3: Alert(3, "pnl", "above", 10.0, now, active=False),  # Inactive
+            4: Alert(4, "vega", "above", 1.0, now),
+        }
+        self.user = {'custom_alerts': self.alerts}
+
+    def test_builds_active_view_and_arrays(self):
+        """Only active alerts are kept, in order, with matching array columns."""
+        self.bot._alerts_changed(self.user)
+        assert list(self.user['_active_alerts']) == [1, 2, 4]
+        active, metric_ids, values, above = self.user['_alert_arrays']
+        assert [alert.id for alert in active] == [1, 2, 4]
+        assert list(metric_ids) == [_ALERT_METRIC_INDEX["delta"], _ALERT_METRIC_INDEX["var"],
+                                    _ALERT_METRIC_INDEX["vega"]]
+        assert metric_ids.dtype == np.intp
+        np.testing.assert_array_equal(values, [100.0, -50.0, 1.0])
+        assert list(above) == [True, False, True]
+
+    def test_skips_unknown_metric_and_condition(self):
+        """Alerts with an unknown metric or condition never reach the arrays."""
+        now = datetime.now()
+        self.alerts[5] = Alert(5, "delta", "equals", 0.0, now)
+        self.alerts[6] = Alert(6, "unknown", "above", 0.0, now)
+        self.bot._alerts_changed(self.user)
+        assert list(self.user['_active_alerts']) == [1, 2, 4]
+
+    def test_version_bumps(self):
+        """Each rebuild bumps the alerts version."""
+        self.bot._alerts_changed(self.user)
+        self.bot._alerts_changed(self.user)
+        assert self.user['_alerts_version'] == 2
+
+    def test_rebuild_reflects_toggle(self):
+        """Deactivating an alert and rebuilding drops it from the evaluated set."""
+        self.bot._alerts_changed(self.user)
+        self.alerts[1].active = False
+        self.bot._alerts_changed(self.user)
+        active, metric_ids, values, above = self.user['_alert_arrays']
+        snapshot = np.full(len(_ALERT_METRIC_INDEX), 1000.0)
+        triggered, _ = _compute_triggered(metric_ids, above, values, snapshot)
+        assert [active[i].id for i in triggered] == [4]
@@ -0,0 +1,50 @@
+"""
+Unit tests for Telegram report chunking in AnalyticsReporter.
+"""
+
+from analytics.reporter import AnalyticsReporter
+
+class TestTelegramReportChunks:
+    """Test cases for generate_telegram_report_chunks."""
+
+    def setup_method(self):
+        """Setup a reporter whose sections are supplied by each test."""
+        self.reporter = AnalyticsReporter()
+
+    def _chunks(self, sections, max_len):
+        self.reporter._telegram_report_sections = lambda report: iter(sections)
+        chunks = list(self.reporter.generate_telegram_report_chunks({}, max_len=max_len))
+        assert all(len(chunk) <= max_len for chunk in chunks)
+        assert "".join(chunks) == "".join(sections)
+        return chunks
+
+    def test_sections_are_packed(self):
+        """Small sections share a chunk until the next one would overflow it."""
+        sections = ["aaaa\n", "bbbb\n", "cccc\n", "dddd\n"]
+        assert self._chunks(sections, max_len=12) == ["aaaa\nbbbb\n", "cccc\ndddd\n"]
+
+    def test_single_chunk(self):
+        """A report that fits is returned as one chunk."""
+        sections = ["header\n", "body\n"]
+        assert self._chunks(sections, max_len=4000) == ["header\nbody\n"]
+
+    def test_oversized_section_splits_at_lines(self):
+        """A section longer than max_len is split at line boundaries, not mid-line."""
+        sections = ["head\n", "line1\nline2\nline3\n", "tail\n"]
+        chunks = self._chunks(sections, max_len=12)
+        assert chunks == ["head\nline1\n", "line2\nline3\n", "tail\n"]
+
+    def test_long_line_hard_split(self):
+        """A single line longer than max_len is hard-split at max_len."""
+        sections = ["ab\n", "x" * 25 + "\n", "cd\n"]
+        chunks = self._chunks(sections, max_len=10)
+        assert chunks == ["ab\n", "x" * 10, "x" * 10, "xxxxx\ncd\n"]
+
+    def test_error_yields_only_error_message(self):
+        """A failure while building sections yields the error message and no partial report."""
+        def failing(report):
+            yield "ok\n"
+            raise KeyError("timestamp")
+        self.reporter._telegram_report_sections = failing
+        chunks = list(self.reporter.generate_telegram_report_chunks({}, max_len=2))
+        assert chunks == ["❌ Error generating report"]
@@ -0,0 +1,61 @@
+"""
+Unit tests for the Deribit ticker stream subscription bookkeeping.
+"""
+import asyncio
+import orjson
+from datetime import datetime
+
+from exchanges.deribit import DeribitExchange
+from exchanges.base import MarketData
+
+class FakeWebSocket:
+    """Records sent frames; never delivers messages."""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+
+    async def send_str(self, data):
+        self.sent.append(orjson.loads(data))
+
+    async def close(self):
+        self.closed = True
+
+class TestTickerSubscriptions:
+    """Test cases for subscribe/unsubscribe on an open stream."""
+
+    def setup_method(self):
+        """Setup a connected exchange with BTC and ETH streamed over a fake socket."""
+        self.exchange = DeribitExchange({})
+        self.exchange.is_connected = True
+        self.exchange._ws = FakeWebSocket()
+        self.exchange._subscribed.update({"BTC-PERPETUAL", "ETH-PERPETUAL"})
+        for symbol in self.exchange._subscribed:
+            self.exchange._latest_ticker[symbol] = MarketData(symbol, 1.0, 0.0, 0.0, datetime.now(), "Deribit")
+
+    def test_unsubscribe_prunes(self):
+        """Unsubscribed instruments leave the resubscribe set and the ticker cache."""
+        ws = self.exchange._ws
+        assert asyncio.run(self.exchange.unsubscribe_tickers(["ETH-PERPETUAL", "SOL-PERPETUAL"]))
+        assert self.exchange._subscribed == {"BTC-PERPETUAL"}
+        assert set(self.exchange._latest_ticker) == {"BTC-PERPETUAL"}
+        assert ws.sent[-1]["method"] == "public/unsubscribe"
+        assert ws.sent[-1]["params"]["channels"] == ["ticker.ETH-PERPETUAL.100ms"]
+        assert not ws.closed
+
+    def test_unsubscribe_all_closes_stream(self):
+        """Removing the last instrument closes the socket instead of unsubscribing."""
+        ws = self.exchange._ws
+        asyncio.run(self.exchange.unsubscribe_tickers(["BTC-PERPETUAL", "ETH-PERPETUAL"]))
+        assert not self.exchange._subscribed
+        assert ws.closed
+        assert ws.sent == []
+
+    def test_subscribe_skips_known(self):
+        """Only instruments not already streamed are sent in a subscribe request."""
+        async def subscribe():
+            self.exchange._ws_task = asyncio.get_running_loop().create_future()  # A running stream
+            await self.exchange.subscribe_tickers(["BTC-PERPETUAL", "SOL-PERPETUAL"])
+        asyncio.run(subscribe())
+        assert self.exchange._ws.sent[-1]["params"]["channels"] == ["ticker.SOL-PERPETUAL.100ms"]
+        assert "SOL-PERPETUAL" in self.exchange._subscribed
@@ -0,0 +1,112 @@
+"""
+Unit tests for the vectorized hedge kernels in hedging.strategies.
+"""
+import asyncio
+import numpy as np
+import pytest
+from datetime import datetime
+
+from hedging.strategies import (
+    DeltaNeutralStrategy, DynamicHedgingStrategy, Side,
+    _hedge_kernel_jit, _hedge_kernel_numpy
+)
+from exchanges.base import Position, MarketData, OrderBook
+from risk.calculator import RiskMetrics
+
+MAX_SIZE = 50.0
+
+def _risk_metrics(delta: float) -> RiskMetrics:
+    return RiskMetrics(
+        delta=delta, gamma=0.0, theta=0.0, vega=0.0, var_95=0.0, var_99=0.0,
+        max_drawdown=0.0, correlation=0.0, beta=1.0, timestamp=datetime.now()
+    )
+
+class TestHedgeKernels:
+    """Both kernels must agree with each other and with the scalar calculate_hedge paths."""
+
+    def setup_method(self):
+        """Setup rows covering the tricky cases."""
+        # (side, size, price, delta, bid, ask)
+        self.rows = [
+            ("long", 10.0, 100.0, 10.0, 99.0, 101.0),       # Plain long, ratio 0.01
+            ("long", 1.0, 100.0, 30.0, np.nan, 102.0),      # Missing bid
+            ("short", 1.0, 100.0, -30.0, 98.0, np.nan),     # Missing ask
+            ("long", 0.0, 100.0, 5.0, 99.0, 101.0),         # Zero position value
+            ("short", 2.0, 100.0, -70.0, 99.5, 100.5),      # Delta above the size cap
+            ("long", 1.0, 100.0, 4.0, np.nan, np.nan),      # Empty book, ratio inside band
+            ("long", 1.0, 100.0, 25.0, 99.0, 101.0),        # Ratio 0.25
+        ]
+        cols = list(zip(*self.rows))
+        self.is_long = np.array([side == "long" for side in cols[0]])
+        self.sizes, self.prices, self.deltas, self.bids, self.asks = (
+            np.array(col, dtype=np.float64) for col in cols[1:]
+        )
+
+    def _run(self, kernel, gated, threshold=0.0, target=0.0, band=0.0):
+        return kernel(self.sizes, self.prices, self.deltas, self.is_long, self.bids, self.asks,
+                      gated, threshold, target, band, MAX_SIZE)
+
+    def _assert_kernels_agree(self, **params):
+        jit = self._run(_hedge_kernel_jit, **params)
+        ref = self._run(_hedge_kernel_numpy, **params)
+        np.testing.assert_allclose(jit[0], ref[0])
+        np.testing.assert_array_equal(jit[1], ref[1])
+        np.testing.assert_allclose(jit[2], ref[2])
+        np.testing.assert_array_equal(jit[3], ref[3])
+        return ref
+
+    def _scalar(self, strategy, i):
+        side, size, price, delta, bid, ask = self.rows[i]
+        position = Position("BTC", size, side, price, price, 0.0, datetime.now(), "test")
+        market_data = MarketData("BTC", price, 0.0, 0.0, datetime.now(), "test")
+        orderbook = OrderBook.from_levels(
+            "BTC-PERP", [] if np.isnan(bid) else [[bid, 1.0]], [] if np.isnan(ask) else [[ask, 1.0]],
+            0, "test"
+        )
+        return asyncio.run(strategy.calculate_hedge(position, _risk_metrics(delta), market_data, orderbook))
+
+    def _assert_matches_scalar(self, strategy, result):
+        out_size, out_side, out_price, trigger = result
+        for i in range(len(self.rows)):
+            order = self._scalar(strategy, i)
+            assert (order is not None) == bool(trigger[i]), f"row {i}"
+            if order is not None:
+                assert order.size == pytest.approx(out_size[i])
+                assert order.price == pytest.approx(out_price[i])
+                assert order.side == Side(out_side[i])
+
+    def test_ungated_matches_delta_neutral(self):
+        """Every row triggers; NaN sides fall back to the market price and sizes are capped."""
+        result = self._assert_kernels_agree(gated=False)
+        out_size, out_side, out_price, trigger = result
+        assert trigger.all()
+        assert out_price[1] == pytest.approx(0.5 * (100.0 + 102.0))
+        assert out_price[2] == pytest.approx(0.5 * (98.0 + 100.0))
+        assert out_price[5] == pytest.approx(100.0)
+        assert out_size[4] == MAX_SIZE
+        assert list(out_side) == [Side.SELL, Side.SELL, Side.BUY, Side.SELL, Side.BUY, Side.SELL, Side.SELL]
+
+        strategy = DeltaNeutralStrategy()
+        for i in range(len(self.rows)):
+            order = self._scalar(strategy, i)
+            assert order.size == pytest.approx(abs(self.deltas[i]))  # Scalar path has no cap
+            assert order.price == pytest.approx(out_price[i])
+            assert order.side == Side(out_side[i])
+
+    def test_threshold_gate_matches_dynamic(self):
+        """Zero target: trigger when the hedge ratio reaches the threshold; zero-value rows never trigger."""
+        strategy = DynamicHedgingStrategy()
+        strategy.max_hedge_size = MAX_SIZE
+        result = self._assert_kernels_agree(gated=True, threshold=strategy.rebalance_threshold)
+        assert list(result[3]) == [False, True, True, False, True, False, True]
+        self._assert_matches_scalar(strategy, result)
+
+    def test_band_gate_matches_dynamic(self):
+        """Non-zero target: trigger only outside target +/- band."""
+        strategy = DynamicHedgingStrategy(target_hedge_ratio=0.3, band_pp=0.1)
+        strategy.max_hedge_size = MAX_SIZE
+        result = self._assert_kernels_agree(gated=True, threshold=strategy.rebalance_threshold,
+                                            target=0.3, band=0.1)
+        # Ratios: 0.01, 0.3, 0.3, -, 0.35, 0.04, 0.25
+        assert list(result[3]) == [True, False, False, False, False, True, False]
+        self._assert_matches_scalar(strategy, result)
@@ -0,0 +1,83 @@
+"""
+Unit tests for hedging strategies and the hedging manager.
+"""
+import asyncio
+from datetime import datetime
+
+from hedging.strategies import DynamicHedgingStrategy, HedgingManager, Side
+from exchanges.base import Position, MarketData
+from risk.calculator import RiskMetrics
+
+class TestHedgingManager:
+    """Test cases for HedgingManager."""
+
+    def test_strategy_info_is_not_shared(self):
+        """Mutating one get_strategy_info result doesn't leak into later calls."""
+        manager = HedgingManager()
+        info = manager.get_strategy_info("dynamic")
+        info["is_active"] = True
+        info["name"] = "changed"
+        assert manager.get_strategy_info("dynamic") == {
+            "name": "Dynamic Hedging",
+            "description": "Dynamic Hedging hedging strategy",
+            "is_active": False
+        }
+        manager.set_strategy("dynamic")
+        assert manager.get_strategy_info("dynamic")["is_active"] is True
+
+class TestDynamicHedgingStrategy:
+    """Test cases for the dynamic strategy's rebalance gates."""
+
+    def setup_method(self):
+        """Setup a 1 BTC long at 100 (position value 100)."""
+        self.position = Position(
+            symbol="BTC", size=1.0, side="long", entry_price=100.0, current_price=100.0,
+            unrealized_pnl=0.0, timestamp=datetime.now(), exchange="test"
+        )
+        self.market_data = MarketData(
+            symbol="BTC", price=100.0, volume_24h=0.0, change_24h=0.0,
+            timestamp=datetime.now(), exchange="test"
+        )
+
+    def _hedge(self, strategy, delta):
+        risk_metrics = RiskMetrics(
+            delta=delta, gamma=0.0, theta=0.0, vega=0.0, var_95=0.0, var_99=0.0,
+            max_drawdown=0.0, correlation=0.0, beta=1.0, timestamp=datetime.now()
+        )
+        return asyncio.run(strategy.calculate_hedge(self.position, risk_metrics, self.market_data, None))
+
+    def test_threshold_gate(self):
+        """Zero target: hedge once the ratio reaches rebalance_threshold."""
+        strategy = DynamicHedgingStrategy()
+        assert self._hedge(strategy, 4.0) is None       # Ratio 0.04 < 0.05
+        order = self._hedge(strategy, 6.0)              # Ratio 0.06
+        assert order is not None
+        assert order.size == 6.0
+        assert order.side == Side.SELL
+
+    def test_band_gate(self):
+        """Non-zero target: hedge only outside target +/- band."""
+        strategy = DynamicHedgingStrategy(target_hedge_ratio=0.5, band_pp=0.1)
+        assert self._hedge(strategy, 45.0) is None       # Ratio 0.45: inside the band, though above the threshold
+        assert self._hedge(strategy, 65.0).size == 65.0  # Ratio 0.65, above the band
+        assert self._hedge(strategy, 30.0).size == 30.0  # Ratio 0.30, below the band
+
+    def test_manager_configures_band(self):
+        """HedgingManager passes its band settings to the dynamic strategy."""
+        manager = HedgingManager(target_hedge_ratio=0.5, band_pp=0.1)
+        assert manager.set_strategy("dynamic")
+        strategy = manager.strategies["dynamic"]
+        assert strategy.target_hedge_ratio == 0.5
+        assert strategy.band_pp == 0.1
+        assert self._hedge(strategy, 45.0) is None
+
+    def test_parameter_change_recompiles(self):
+        """Changing a parameter updates the compiled scalar gate and the batch path alike."""
+        strategy = DynamicHedgingStrategy()
+        strategy.max_hedge_size = 5.0
+        strategy.rebalance_threshold = 0.5
+        assert self._hedge(strategy, 45.0) is None
+        assert self._hedge(strategy, 60.0).size == 5.0
+        
+        batch = strategy.calculate_hedge_batch([self.position] * 2, [45.0, 60.0], [100.0, 100.0])
+        assert [order.size for order in batch] == [5.0]
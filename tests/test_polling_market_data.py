@@ -0,0 +1,48 @@
+"""
+Unit tests for the shared per-position market data builder.
+"""
+import asyncio
+from datetime import datetime
+
+from bot.telegram_bot import HedgingBot
+from exchanges.base import Position
+
+class TestBuildMarketData:
+    """Test cases for HedgingBot._build_market_data."""
+
+    def setup_method(self):
+        """Setup a bare bot with stubbed prices (ETH has no price)."""
+        self.bot = HedgingBot.__new__(HedgingBot)
+        self.bot._fetch_semaphore = asyncio.Semaphore(16)
+        self.prices = {"BTC": 51000.0, "SOL": 150.0, "ETH": None}
+
+        async def fetch_price(asset):
+            return self.prices[asset]
+        self.bot.fetch_price = fetch_price
+        self.user = {'positions': {}, '_positions_view': []}
+
+    def _entry(self, asset):
+        position = Position(asset, 1.0, "long", 100.0, 100.0, 0.0, datetime.now(), "deribit", underlying=asset)
+        return {'position': position, 'threshold': 0.05, 'suppress_alerts': False, 'history': [], 'is_active': True}
+
+    def test_builds_fresh_market_data(self):
+        """Each call builds new MarketData carrying the latest price, timestamp and position fields."""
+        self.bot._add_position(self.user, "BTC", self._entry("BTC"))
+        ts = datetime(2024, 3, 5, 9, 0)
+        first = asyncio.run(self.bot._build_market_data(self.user, ts=ts))
+        second = asyncio.run(self.bot._build_market_data(self.user, ts=ts))
+        assert first["BTC"] is not second["BTC"]
+        assert first["BTC"].price == 51000.0
+        assert first["BTC"].timestamp == ts
+        assert first["BTC"].underlying == "BTC"
+
+    def test_entry_added_directly(self):
+        """Entries written directly into positions are built too; missing prices are skipped."""
+        self.bot._add_position(self.user, "BTC", self._entry("BTC"))
+        self.user['positions']['SOL'] = self._entry("SOL")
+        self.user['positions']['ETH'] = self._entry("ETH")
+        market_data = asyncio.run(self.bot._build_market_data(self.user, ts=datetime.now()))
+        assert set(market_data) == {"BTC", "SOL"}
+        assert market_data["SOL"].price == 150.0
+        assert market_data["SOL"].exchange == "deribit"
+        assert market_data["SOL"].underlying == "SOL"
@@ -0,0 +1,121 @@
+"""
+Unit tests for the periodic risk summary scheduler.
+"""
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+
+import bot.telegram_bot as telegram_bot
+from bot.telegram_bot import HedgingBot, _next_summary_fire
+
+class TestNextSummaryFire:
+    """Test cases for _next_summary_fire."""
+
+    def test_daily(self):
+        """Daily fires at 9:00 today if still ahead, otherwise tomorrow."""
+        assert _next_summary_fire('daily', datetime(2024, 3, 5, 8, 0)) == datetime(2024, 3, 5, 9, 0)
+        assert _next_summary_fire('daily', datetime(2024, 3, 5, 9, 0)) == datetime(2024, 3, 6, 9, 0)
+
+    def test_weekly(self):
+        """Weekly fires on the next Monday at 9:00."""
+        assert _next_summary_fire('weekly', datetime(2024, 3, 6, 12, 0)) == datetime(2024, 3, 11, 9, 0)
+        assert _next_summary_fire('weekly', datetime(2024, 3, 11, 8, 0)) == datetime(2024, 3, 11, 9, 0)
+
+class TestPeriodicSummaryTask:
+    """Test cases for HedgingBot._periodic_summary_task against a fake clock."""
+
+    def setup_method(self):
+        """Setup a bare bot that records sends and a clock starting at 2024-03-05 08:00."""
+        self.clock = [datetime(2024, 3, 5, 8, 0)]
+        self.sent = []
+        self.bot = HedgingBot.__new__(HedgingBot)
+
+        async def send(chat_id):
+            self.sent.append((chat_id, self.clock[0]))
+        self.bot._send_risk_summary = send
+
+    def _run(self, monkeypatch, early_by: timedelta, sleeps: int):
+        clock = self.clock
+
+        class FakeDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return clock[0]
+
+        calls = []
+
+        async def fake_sleep(seconds):
+            calls.append(seconds)
+            if len(calls) > sleeps:
+                raise asyncio.CancelledError
+            # Wake early by the wall clock on long sleeps only
+            clock[0] += timedelta(seconds=seconds) - (early_by if seconds > 3600 else timedelta(0))
+
+        monkeypatch.setattr(telegram_bot, "datetime", FakeDatetime)
+        monkeypatch.setattr(telegram_bot.asyncio, "sleep", fake_sleep)
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(self.bot._periodic_summary_task('daily', {1}))
+
+    def test_early_wake_sends_once(self, monkeypatch):
+        """A sleep ending an hour early waits out the remainder and sends once per day."""
+        self._run(monkeypatch, early_by=timedelta(hours=1), sleeps=6)
+        assert [ts for _, ts in self.sent] == [
+            datetime(2024, 3, 5, 9, 0), datetime(2024, 3, 6, 9, 0), datetime(2024, 3, 7, 9, 0)
+        ]
+
+    def test_stall_skips_missed_deliveries(self, monkeypatch):
+        """Deliveries missed while the loop was stalled are skipped, not sent in a burst."""
+        async def slow_send(chat_id):
+            self.sent.append((chat_id, self.clock[0]))
+            self.clock[0] += timedelta(days=3)
+        self.bot._send_risk_summary = slow_send
+        self._run(monkeypatch, early_by=timedelta(0), sleeps=2)
+        assert [ts for _, ts in self.sent] == [datetime(2024, 3, 5, 9, 0), datetime(2024, 3, 9, 9, 0)]
+
+class TestStopMonitoringAll:
+    """Regression tests for /stop_monitoring ALL and the summary subscribers."""
+
+    def setup_method(self):
+        """Setup a bare bot with chat 42 subscribed to daily summaries and a pending suppression timer."""
+        self.bot = HedgingBot.__new__(HedgingBot)
+        self.bot.user_data = {}
+        self.bot._daily_subs = set()
+        self.bot._weekly_subs = set()
+        self.bot._suppress_timers = {}
+        self.bot._pending_timers = {}
+        self.sent = []
+
+        async def send(chat_id, text, **kwargs):
+            self.sent.append((chat_id, text))
+        self.bot._rate_limited_send = send
+
+    def test_stop_all_unsubscribes_and_does_not_recreate_users(self):
+        """After /stop_monitoring, scheduled summaries neither reach nor recreate the dropped chat."""
+        class Message:
+            async def reply_text(self, text, **kwargs):
+                pass
+
+        class Update:
+            effective_message = Message()
+            effective_chat = None
+
+        class Context:
+            args = []
+
+        async def scenario():
+            user = self.bot._get_user(42)
+            user['positions']['BTC'] = {'is_active': True}
+            self.bot._set_summary_schedule(42, 'daily')
+            handle = asyncio.get_running_loop().call_later(3600, lambda: None)
+            self.bot._suppress_timers[(42, 'BTC')] = handle
+            await self.bot.stop_monitoring_command(Update(), Context())
+            await self.bot._send_risk_summary(42)
+            return user, handle
+
+        user, handle = asyncio.run(scenario())
+        assert 42 not in self.bot._daily_subs
+        assert 42 not in self.bot.user_data
+        assert self.sent == []
+        assert self.bot._suppress_timers == {}
+        assert handle.cancelled()
+        assert user['positions']['BTC']['is_active'] is False
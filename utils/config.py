@@ -45,6 +45,10 @@ class Config:
     DEFAULT_RISK_THRESHOLD = 0.05  # 5% default risk threshold
     MAX_POSITION_SIZE = 1000000    # Maximum position size in USD
     HEDGE_RATIO_THRESHOLD = 0.1    # 10% threshold for hedge ratio adjustments
+    # Dynamic strategy band rebalancing: trade once the hedge ratio leaves target +/- band.
+    # A zero target keeps the single rebalance-threshold gate.
+    DYNAMIC_TARGET_HEDGE_RATIO = float(os.getenv("DYNAMIC_TARGET_HEDGE_RATIO", "0"))
+    DYNAMIC_HEDGE_BAND = float(os.getenv("DYNAMIC_HEDGE_BAND", "0.15"))
     
     # Monitoring Configuration
     UPDATE_INTERVAL = 30  # seconds between risk calculations
@@ -0,0 +1,24 @@
+"""
+Optional uvloop event loop support.
+
+When uvloop is installed (non-Windows only), install_uvloop() makes it the
+asyncio event loop policy, so every loop created afterwards (including the one
+python-telegram-bot starts) runs aiohttp's socket I/O on libuv. Without uvloop
+the default asyncio loop is kept and behaviour is unchanged.
+"""
+import asyncio
+import sys
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = sys.platform != "win32"
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+def install_uvloop() -> bool:
+    """Set uvloop as the event loop policy if available; returns True when installed."""
+    if not UVLOOP_AVAILABLE:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
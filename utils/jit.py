@@ -0,0 +1,22 @@
+"""
+Optional Numba JIT support for numerical kernels.
+
+Kernels decorated with ``njit`` from this module are compiled by Numba when it
+is installed. Without Numba the decorator returns the function unchanged, so
+the kernels run as plain NumPy code with identical results.
+"""
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit supporting both @njit and @njit(...)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(fn):
+            return fn
+        return decorator
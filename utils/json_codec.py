@@ -0,0 +1,19 @@
+"""
+Fast JSON encoding/decoding with a stdlib fallback.
+
+Uses orjson when it is installed. Without it, ``loads``/``dumps`` are the
+standard library ``json`` functions, so callers behave the same either way.
+"""
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+    loads = orjson.loads
+
+    def dumps(obj) -> str:
+        """Encode obj as a JSON str (aiohttp's json_serialize expects str, not bytes)."""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    from json import loads, dumps
+
+    ORJSON_AVAILABLE = False
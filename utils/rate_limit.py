@@ -0,0 +1,28 @@
+"""
+Async rate limiting for outbound API calls.
+"""
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """Token bucket allowing `rate` acquisitions per `per` seconds, with bursts up to `rate`."""
+
+    def __init__(self, rate: float = 28, per: float = 1.0):
+        self.capacity = float(rate)
+        self.fill_rate = rate / per  # tokens per second
+        self.tokens = float(rate)
+        self.last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available, then consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.fill_rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.fill_rate)